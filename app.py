@@ -4,7 +4,7 @@
 # par une interface HTML/CSS/JS, sans modifier la logique mathématique.
 # ============================================================
 
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context
 
 import sympy as sp
 from sympy import symbols, re, im, conjugate, I
@@ -12,13 +12,36 @@ from sympy import *
 from sympy import ln as log
 import matplotlib
 matplotlib.use("Agg")  # backend non-interactif côté serveur
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from sympy.calculus.util import continuous_domain
 from sympy import S
 from sympy.assumptions import Q, ask
 
 import io
 import base64
+import json
+import math
+import contextvars
+import itertools
+import multiprocessing
+import os
+import pickle
+import queue
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import cached_property
+
+import mpmath
+from mpmath import iv
+import numpy as np
 
 app = Flask(__name__)
 
@@ -29,16 +52,68 @@ app = Flask(__name__)
 # ------------------------------------------------------------
 k = sp.symbols('k', integer=True, positive=True)
 
+# Symboles et dictionnaire de sympify des saisies (construits une seule fois)
+SYMBOLE_N = sp.symbols('n', integer=True, positive=True)
+SYMBOLE_X = sp.symbols('x', real=True)
+LOCALS_SAISIE = {
+    "n": SYMBOLE_N,
+    "x": SYMBOLE_X,
+    "arctan": atan, "arcsin": asin, "arccos": acos,
+    "arctanh": atanh, "arcsinh": asinh, "arccosh": acosh,
+    "arcsec": asec, "arccot": acot, "arccsc": acsc,
+    "sin": sin
+}
+
 # ============================================================
 # Faux Streamlit : garde les appels st.latex(), st.info(), st.error(), st.pyplot()
+# La liste de sortie est propre à chaque requête (variable de contexte) :
+# deux requêtes servies en parallèle (threads ou tâches async) ne se mélangent pas.
 # ============================================================
 
+_sortie = contextvars.ContextVar("sortie", default=None)
+
+
+class _Relais(list):
+    """
+    Liste de messages qui transmet aussi chaque message, dès son ajout,
+    à `relayer` (sortie englobante, file d'un flux /compute/flux, ...).
+    """
+
+    def __init__(self, relayer):
+        super().__init__()
+        self.relayer = relayer
+
+    def append(self, message):
+        super().append(message)
+        self.relayer(message)
+
+    def extend(self, messages):
+        for message in messages:
+            self.append(message)
+
+
 class _StreamlitCompat:
-    def __init__(self):
-        self._out = []
+    @property
+    def _out(self):
+        out = _sortie.get()
+        # hors requête : les messages sont simplement ignorés
+        return out if out is not None else []
 
     def set_out(self, out):
-        self._out = out
+        return _sortie.set(out)
+
+    def reset_out(self, jeton):
+        _sortie.reset(jeton)
+
+    @contextmanager
+    def collecte(self, out=None):
+        # collecteur de messages pour la durée du bloc `with`
+        out = [] if out is None else out
+        jeton = self.set_out(out)
+        try:
+            yield out
+        finally:
+            self.reset_out(jeton)
 
     def set_page_config(self, **kwargs):
         pass
@@ -67,17 +142,492 @@ class _StreamlitCompat:
     def error(self, msg):
         self._out.append({"type": "error", "content": str(msg)})
 
-    def pyplot(self, fig):
-        buf = io.BytesIO()
-        fig.savefig(buf, format="png", bbox_inches="tight")
-        plt.close(fig)
-        buf.seek(0)
-        b64 = base64.b64encode(buf.read()).decode("utf-8")
-        self._out.append({"type": "plot", "content": b64})
+    def timeout(self, msg):
+        # marqueur de résultat partiel (délai dépassé)
+        self._out.append({"type": "timeout", "content": str(msg)})
+
+    def pyplot(self, fig, format="png"):
+        self._out.append(message_figure(fig, format))
+
+    def graphe(self, message):
+        # message de graphe déjà construit (cf. graphe / CACHE_GRAPHES)
+        self._out.append(dict(message))
 
 
 st = _StreamlitCompat()
 
+
+# ============================================================
+# Caches en mémoire (partagés par le processus)
+# ============================================================
+
+class CacheLRU:
+    """
+    Cache borné avec éviction LRU, durée de vie optionnelle (ttl, en secondes)
+    et compteurs de succès / échecs. Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, taille=256, ttl=None):
+        self.taille = taille
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._donnees = OrderedDict()
+        self._verrou = threading.Lock()
+        self._journal = None
+
+    def configurer(self, taille=None, ttl=None):
+        with self._verrou:
+            if taille is not None:
+                self.taille = taille
+            self.ttl = ttl
+            while len(self._donnees) > max(self.taille, 0):
+                self._donnees.popitem(last=False)
+
+    def get(self, cle, defaut=None):
+        with self._verrou:
+            entree = self._donnees.get(cle)
+            if entree is not None:
+                valeur, instant = entree
+                if self.ttl is None or time.monotonic() - instant < self.ttl:
+                    self._donnees.move_to_end(cle)
+                    self.hits += 1
+                    return valeur
+                del self._donnees[cle]
+            self.misses += 1
+            return defaut
+
+    def contient(self, cle):
+        # présence d'une entrée valide, sans toucher aux compteurs ni à l'ordre LRU
+        with self._verrou:
+            entree = self._donnees.get(cle)
+            return entree is not None and (self.ttl is None or time.monotonic() - entree[1] < self.ttl)
+
+    def set(self, cle, valeur):
+        with self._verrou:
+            if self.taille <= 0:
+                return
+            if self._journal is not None:
+                self._journal.append((cle, valeur))
+            self._donnees[cle] = (valeur, time.monotonic())
+            self._donnees.move_to_end(cle)
+            while len(self._donnees) > self.taille:
+                self._donnees.popitem(last=False)
+
+    def clear(self):
+        with self._verrou:
+            self._donnees.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def journaliser(self):
+        # dans un processus fils (fork) : verrou neuf, et chaque entrée ajoutée
+        # désormais notée dans la liste renvoyée (cf. _executer_dans_fils)
+        self._verrou = threading.Lock()
+        self._journal = []
+        return self._journal
+
+    def stats(self):
+        with self._verrou:
+            total = self.hits + self.misses
+            return {
+                "entrees": len(self._donnees),
+                "taille": self.taille,
+                "hits": self.hits,
+                "misses": self.misses,
+                "taux": self.hits / total if total else 0.0,
+            }
+
+
+# (terme saisi tel quel, variable, indice de départ, format des graphes)
+#   → (verdict, critère décisif, messages produits, graphes compris)
+# Le terme n'est pas simplifié dans la clé : les messages rejoués citent la
+# série saisie (Σ, a_n de Leibniz...), propre à l'écriture de l'entrée.
+CACHE_VERDICTS = CacheLRU(taille=512, ttl=None)
+
+
+# ------------------------------------------------------------
+# Mémo des opérations symboliques coûteuses (simplify, limit_seq, signes)
+# Clé = l'expression elle-même. Deux niveaux : un dictionnaire propre à la
+# requête (cf. memo_symbolique) puis, si sa taille est > 0, un cache partagé.
+# ------------------------------------------------------------
+
+_ABSENT = object()
+_memo_requete = contextvars.ContextVar("memo_requete", default=None)
+MEMO_SYMBOLIQUE = CacheLRU(taille=4096, ttl=None)
+
+
+@contextmanager
+def memo_symbolique():
+    jeton = _memo_requete.set({})
+    try:
+        yield
+    finally:
+        _memo_requete.reset(jeton)
+
+
+def _memoise(cle, calcul):
+    memo = _memo_requete.get()
+    if memo is not None and cle in memo:
+        return memo[cle]
+
+    valeur = MEMO_SYMBOLIQUE.get(cle, _ABSENT)
+    if valeur is _ABSENT:
+        valeur = calcul()
+        MEMO_SYMBOLIQUE.set(cle, valeur)
+
+    if memo is not None:
+        memo[cle] = valeur
+    return valeur
+
+
+def _memorise(cle):
+    # résultat déjà connu (requête ou cache partagé) : _memoise ne calculera rien
+    memo = _memo_requete.get()
+    return (memo is not None and cle in memo) or MEMO_SYMBOLIQUE.contient(cle)
+
+
+def simplifier(expression):
+    expression = sp.sympify(expression)
+    # simplification déjà abandonnée pour cette requête (cf. simplifier_borne)
+    memo = _memo_requete.get()
+    if memo is not None and ("simplification abandonnée", expression) in memo:
+        return expression
+    return _memoise(("simplify", expression), lambda: sp.simplify(expression))
+
+
+def limite_suite(expression, variable):
+    expression = sp.sympify(expression)
+    return _memoise(("limit_seq", expression, variable),
+                    lambda: sp.limit_seq(expression, variable))
+
+
+def limite(expression, variable):
+    # limite en +oo (sp.limit), mémorisée
+    expression = sp.sympify(expression)
+    return _memoise(("limit", expression, variable),
+                    lambda: sp.limit(expression, variable, sp.oo))
+
+
+def est(expression, propriete):
+    # est(expr, "nonnegative") ≡ expr.is_nonnegative, mémorisé
+    expression = sp.sympify(expression)
+    return _memoise(("is", propriete, expression),
+                    lambda: getattr(expression, "is_" + propriete))
+
+
+# ============================================================
+# Profilage par étape (critères, graphes, limites, dl)
+# Temps inclusifs : un critère qui en appelle d'autres (équivalence → critere)
+# compte aussi leur durée. Inactif hors d'un bloc `profilage`.
+# ============================================================
+
+_profil = contextvars.ContextVar("profil", default=None)
+
+
+@contextmanager
+def profilage(profil=None):
+    # profil : dictionnaire étape → {"appels", "duree"} complété pendant le bloc
+    profil = {} if profil is None else profil
+    jeton = _profil.set(profil)
+    try:
+        yield profil
+    finally:
+        _profil.reset(jeton)
+
+
+@contextmanager
+def mesurer(nom):
+    profil = _profil.get()
+    if profil is None:
+        yield
+        return
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        noter_duree(nom, time.perf_counter() - debut)
+
+
+def noter_duree(nom, duree):
+    # ajoute au profil courant une durée déjà mesurée (ex. dictionnaire `temps`)
+    profil = _profil.get()
+    if profil is None:
+        return
+    entree = profil.setdefault(nom, {"appels": 0, "duree": 0.0})
+    entree["appels"] += 1
+    entree["duree"] += duree
+
+
+def fusionner_profil(recu):
+    # ajoute au profil courant un profil mesuré ailleurs (ex. processus du pool)
+    profil = _profil.get()
+    if profil is None:
+        return
+    for nom, mesure in recu.items():
+        entree = profil.setdefault(nom, {"appels": 0, "duree": 0.0})
+        entree["appels"] += mesure["appels"]
+        entree["duree"] += mesure["duree"]
+
+
+# ============================================================
+# Délais d'exécution
+# Délai global pour une analyse et budget par critère : un critère qui
+# dépasse son budget est abandonné (ses messages sont ignorés) et on passe
+# au suivant. En mode local, les threads ne pouvant pas être tués, le calcul
+# abandonné se termine en arrière-plan sans effet sur la réponse ; dans un
+# processus du pool, les calculs « tuables » (critères, simplification, somme,
+# rayon) tournent dans un processus fils (fork) tué au dépassement, et les
+# entrées de cache qu'il a calculées sont recopiées dans le processus du pool.
+# Une étape dont le budget va au-delà de celui de l'étape englobante est
+# exécutée directement : c'est l'englobante qui sera interrompue.
+# ============================================================
+
+DELAI_GLOBAL = 60.0         # secondes, None = pas de limite
+DELAI_CRITERE = 15.0        # secondes, None = pas de limite
+DELAI_SIMPLIFICATION = 5.0  # secondes : au-delà, le terme est étudié tel que saisi
+
+_echeance = contextvars.ContextVar("echeance", default=None)
+_delai_global = contextvars.ContextVar("delai_global", default=None)
+_delai_critere = contextvars.ContextVar("delai_critere", default=None)
+_depassements = contextvars.ContextVar("depassements", default=None)
+_echeance_etape = contextvars.ContextVar("echeance_etape", default=None)
+_course = contextvars.ContextVar("course", default=None)   # numéro de la course de critères
+PAS_ABANDON = 0.1           # secondes entre deux vérifications de course_terminee
+
+
+class DelaiDepasse(Exception):
+    pass
+
+
+@contextmanager
+def delais(delai_global=None, delai_critere=None):
+    echeance = None if delai_global is None else time.monotonic() + delai_global
+    jetons = (
+        _echeance.set(echeance),
+        _delai_critere.set(delai_critere),
+        _depassements.set([]),
+        _delai_global.set(delai_global),
+    )
+    try:
+        yield _depassements.get()
+    finally:
+        _delai_global.reset(jetons[3])
+        _depassements.reset(jetons[2])
+        _delai_critere.reset(jetons[1])
+        _echeance.reset(jetons[0])
+
+
+def temps_restant():
+    echeance = _echeance.get()
+    return None if echeance is None else echeance - time.monotonic()
+
+
+def nombre_depassements():
+    depassements = _depassements.get()
+    return 0 if depassements is None else len(depassements)
+
+
+def _signaler_depassement(nom, delai, par_echeance=False):
+    depassements = _depassements.get()
+    if depassements is not None:
+        depassements.append(nom)
+    if par_echeance:
+        # c'est le délai global de l'analyse qui est épuisé, pas le budget de l'étape
+        etat = "non lancé" if delai <= 0 else "interrompu"
+        st.timeout(f"« {nom} » {etat} : délai global de {_delai_global.get() or 0:.1f} s "
+                   "épuisé (résultat partiel).")
+    else:
+        st.timeout(f"« {nom} » interrompu : délai de {max(delai, 0):.1f} s dépassé (résultat partiel).")
+    raise DelaiDepasse(nom)
+
+
+# fork disponible (Linux, macOS) : calculs sous budget tuables dans les processus du pool
+_CONTEXTE_FILS = (multiprocessing.get_context("fork")
+                  if "fork" in multiprocessing.get_all_start_methods() else None)
+_dans_fils = False
+
+
+def executer_avec_budget(nom, fonction, *args, budget=None, tuable=False):
+    """
+    Exécute fonction(*args) en respectant le budget et le délai global restant.
+    Sans aucune limite, ou si l'étape englobante s'arrête avant, l'appel est direct.
+    Sinon le calcul tourne dans un thread (même contexte, sortie privée), ou, s'il
+    est tuable, dans un processus fils depuis un processus du pool ; en cas de
+    dépassement, lève DelaiDepasse.
+    La durée est comptée dans le profil sous le nom `nom`.
+    """
+    with mesurer(nom):
+        return _executer_avec_budget(nom, fonction, *args, budget=budget, tuable=tuable)
+
+
+def _executer_avec_budget(nom, fonction, *args, budget=None, tuable=False):
+    delai = budget
+    restant = temps_restant()
+    par_echeance = restant is not None and (delai is None or restant < delai)
+    if par_echeance:
+        delai = restant
+    if delai is None:
+        return fonction(*args)
+    if delai <= 0:
+        _signaler_depassement(nom, 0, par_echeance)
+
+    echeance = time.monotonic() + delai
+    englobante = _echeance_etape.get()
+    if englobante is not None and englobante <= echeance:
+        return fonction(*args)
+
+    if (tuable and _CONTEXTE_FILS is not None and multiprocessing.parent_process() is not None
+            and not _dans_fils):
+        return _executer_dans_fils(nom, fonction, args, delai, par_echeance)
+
+    messages = []
+    resultat = {}
+
+    def cible():
+        st.set_out(messages)
+        _echeance_etape.set(echeance)
+        try:
+            resultat["valeur"] = fonction(*args)
+        except BaseException as e:
+            resultat["erreur"] = e
+
+    fil = threading.Thread(target=contextvars.copy_context().run, args=(cible,), daemon=True)
+    fil.start()
+    fil.join(delai)
+
+    if fil.is_alive():
+        _signaler_depassement(nom, delai, par_echeance)
+
+    st._out.extend(messages)
+    if "erreur" in resultat:
+        raise resultat["erreur"]
+    return resultat.get("valeur")
+
+
+def _executer_dans_fils(nom, fonction, args, delai, par_echeance):
+    """
+    Variante de _executer_avec_budget pour les processus du pool : le calcul tourne
+    dans un fils (fork) tué au dépassement, au lieu d'un thread qui continuerait à
+    occuper le GIL. Les messages, le bilan, le profil, les dépassements imbriqués et
+    les entrées de cache (mémo de la requête compris) sont renvoyés au parent.
+    """
+    lecture, ecriture = _CONTEXTE_FILS.Pipe(duplex=False)
+    echeance = time.monotonic() + delai
+
+    def cible():
+        global _dans_fils
+        _dans_fils = True
+        journaux = [cache.journaliser() for cache in _caches_transmis()]
+        memo = _memo_requete.get()
+        avant_memo = 0 if memo is None else len(memo)
+        messages = []
+        st.set_out(messages)
+        _echeance_etape.set(echeance)
+        depassements = _depassements.get()
+        avant = 0 if depassements is None else len(depassements)
+        try:
+            resultat = ("valeur", fonction(*args))
+        except BaseException as e:
+            resultat = ("erreur", e)
+        caches = ([_serialiser(journal) for journal in journaux],
+                  _serialiser([] if memo is None else list(memo.items())[avant_memo:]))
+        etat = (messages, _bilan.get(), _profil.get(), (depassements or [])[avant:], caches)
+        try:
+            ecriture.send((resultat, *etat))
+        except Exception as e:
+            # valeur ou exception non sérialisable
+            ecriture.send((("erreur", RuntimeError(f"{type(e).__name__}: {e}")), *etat))
+
+    fils = _CONTEXTE_FILS.Process(target=contextvars.copy_context().run, args=(cible,), daemon=True)
+    fils.start()
+    ecriture.close()
+    try:
+        if not _attendre_fils(lecture, echeance):
+            fils.kill()
+            _signaler_depassement(nom, delai, par_echeance)
+        try:
+            resultat, messages, bilan, profil, depassements, caches = lecture.recv()
+        except EOFError:
+            raise RuntimeError(f"« {nom} » : le processus de calcul s'est arrêté brutalement.")
+    finally:
+        lecture.close()
+        fils.join()
+
+    entrees_caches, entrees_memo = caches
+    for cache, entrees in zip(_caches_transmis(), entrees_caches):
+        for cle, valeur in map(pickle.loads, entrees):
+            cache.set(cle, valeur)
+    memo = _memo_requete.get()
+    if memo is not None:
+        memo.update(map(pickle.loads, entrees_memo))
+
+    st._out.extend(messages)
+    for local, recu in ((_bilan.get(), bilan), (_profil.get(), profil)):
+        if local is not None and recu is not None:
+            local.clear()
+            local.update(recu)
+    if _depassements.get() is not None:
+        _depassements.get().extend(depassements)
+
+    genre, valeur = resultat
+    if genre == "erreur":
+        raise valeur
+    return valeur
+
+
+def _attendre_fils(lecture, echeance):
+    # True dès que le fils a répondu ; False à l'échéance, ou dès que la course
+    # dont il fait partie est terminée par un autre critère (cf. _course_criteres)
+    course = _course.get()
+    while True:
+        restant = echeance - time.monotonic()
+        if restant <= 0:
+            return False
+        if lecture.poll(restant if course is None else min(restant, PAS_ABANDON)):
+            return True
+        if course is not None and course_terminee(course):
+            return False
+
+
+def _caches_transmis():
+    # caches partagés recopiés depuis un processus fils (cf. _executer_dans_fils)
+    return MEMO_SYMBOLIQUE, CACHE_DEVELOPPEMENTS, CACHE_GRAPHES, CACHE_LAMBDIFY
+
+
+def _serialiser(entrees):
+    # entrées (clé, valeur) picklées une à une ; les non sérialisables
+    # (fonctions lambdifiées...) restent dans le fils
+    serialisees = []
+    for entree in entrees:
+        try:
+            serialisees.append(pickle.dumps(entree))
+        except Exception:
+            pass
+    return serialisees
+
+
+def simplifier_borne(expression):
+    """
+    simplifier sous budget (DELAI_SIMPLIFICATION) ; au-delà, l'expression est
+    gardée telle quelle, et l'abandon retenu pour le reste de la requête.
+    Une simplification déjà mémorisée est relue directement.
+    """
+    expression = sp.sympify(expression)
+    if _memorise(("simplify", expression)):
+        return simplifier(expression)
+    budget = DELAI_SIMPLIFICATION
+    if _delai_critere.get() is not None:
+        budget = min(budget, _delai_critere.get())
+    try:
+        return executer_avec_budget("simplification", simplifier, expression, budget=budget,
+                                    tuable=True)
+    except DelaiDepasse:
+        memo = _memo_requete.get()
+        if memo is not None:
+            memo[("simplification abandonnée", expression)] = True
+        return expression
+
 # ============================================================
 # Dictionnaire des fonctions bornées connues (aucune fonction composée ici)
 # ============================================================
@@ -89,6 +639,14 @@ BORNES_CONNUES = {
     sp.Abs: (0, None),
 }
 
+# ------------------------------------------------------------
+# Horizons des graphes (nombre d'indices tracés)
+# Le moteur de sommes partielles est en O(N) : les sommes sont calculées
+# (np.cumsum) jusqu'à 10**5 puis sous-échantillonnées pour le tracé
+# ------------------------------------------------------------
+HORIZON_SOMMES = 100_000
+HORIZON_SUITE = 1500
+
 
 
 
@@ -101,7 +659,7 @@ def signe_asymptotique(expr, n):
 
     # 2. Test par la limite
     try:
-        L = sp.limit(expr, n, sp.oo)
+        L = limite(expr, n)
         if L.is_positive:
             return 1
         if L.is_negative:
@@ -156,19 +714,19 @@ def domination_log(expression, n):
     return None
 
 def min_borne(a, b):
-    diff = sp.simplify(a - b)
-    if diff.is_nonpositive:
+    diff = simplifier(a - b)
+    if est(diff, "nonpositive"):
         return a
-    elif diff.is_nonnegative:
+    elif est(diff, "nonnegative"):
         return b
     return a
 
 
 def max_borne(a, b):
-    diff = sp.simplify(a - b)
-    if diff.is_nonnegative:
+    diff = simplifier(a - b)
+    if est(diff, "nonnegative"):
         return a
-    elif diff.is_nonpositive:
+    elif est(diff, "nonpositive"):
         return b
     return b
 
@@ -200,7 +758,7 @@ def borne_somme(expression, variable):
             tmin, tmax = encadrements(terme, variable)
             somme_min += tmin
             somme_max += tmax
-        return sp.simplify(somme_min), sp.simplify(somme_max)
+        return simplifier(somme_min), simplifier(somme_max)
     return None
 
 
@@ -215,7 +773,7 @@ def borne_produit(expression, variable):
             c3 = max_borne(prod_min * fmin, prod_min * fmax)
             c4 = max_borne(prod_max * fmin, prod_max * fmax)
             prod_max = max_borne(c3, c4)
-        return sp.simplify(prod_min), sp.simplify(prod_max)
+        return simplifier(prod_min), simplifier(prod_max)
     return None
 
 
@@ -235,11 +793,11 @@ def borne_puissance(expression, variable):
             # inversion seulement si le signe est contrôlé
             if bmin.is_positive:
                 # 0 < bmin ≤ base ≤ bmax
-                return sp.simplify(1/bmax), sp.simplify(1/bmin)
+                return simplifier(1/bmax), simplifier(1/bmin)
 
             if bmax.is_negative:
                 # bmin ≤ base ≤ bmax < 0
-                return sp.simplify(1/bmin), sp.simplify(1/bmax)
+                return simplifier(1/bmin), simplifier(1/bmax)
 
             # signe inconnu → on refuse
             return None
@@ -248,18 +806,18 @@ def borne_puissance(expression, variable):
         if exposant.is_Integer and exposant % 2 == 0:
             # base toujours ≥ 0
             if bmin.is_nonnegative:
-                return sp.simplify(bmin**exposant), sp.simplify(bmax**exposant)
+                return simplifier(bmin**exposant), simplifier(bmax**exposant)
 
             # base toujours ≤ 0
             if bmax.is_nonpositive:
-                return sp.simplify(bmax**exposant), sp.simplify(bmin**exposant)
+                return simplifier(bmax**exposant), simplifier(bmin**exposant)
 
             # base change de signe
-            return 0, sp.simplify(max(abs(bmin), abs(bmax))**exposant)
+            return 0, simplifier(max(abs(bmin), abs(bmax))**exposant)
 
         # Cas exposant impair
         if exposant.is_Integer and exposant % 2 == 1:
-            return sp.simplify(bmin**exposant), sp.simplify(bmax**exposant)
+            return simplifier(bmin**exposant), simplifier(bmax**exposant)
 
         return None
 
@@ -282,13 +840,13 @@ def borne_fraction(expression, variable):
         if signe == 1:
             min_total = min_borne(nmin / dmax, nmax / dmax)
             max_total = max_borne(nmin / dmin, nmax / dmin)
-            return sp.simplify(min_total), sp.simplify(max_total)
+            return simplifier(min_total), simplifier(max_total)
 
         # dénominateur négatif à l’infini
         if signe == -1:
             min_total = min_borne(nmax / dmax, nmin / dmax)
             max_total = max_borne(nmax / dmin, nmin / dmin)
-            return sp.simplify(min_total), sp.simplify(max_total)
+            return simplifier(min_total), simplifier(max_total)
 
         # signe incertain → on refuse l’encadrement
         return None
@@ -319,9 +877,395 @@ def encadrements(expression, variable):
     return expression, expression
 
 
-def graphe(u_n, n, c):
+# ------------------------------------------------------------
+# Cache de compilation (sp.lambdify) : génération de code faite une seule fois
+# par (expression, variables, modules). NumExpr, s'il est installé, sert de
+# noyau compilé pour les grandes grilles d'évaluation.
+# ------------------------------------------------------------
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+SEUIL_NUMEXPR = 50_000     # taille de grille à partir de laquelle on tente NumExpr
+
+CACHE_LAMBDIFY = CacheLRU(taille=256, ttl=None)
+
+
+def compiler(variables, expression, modules='numpy'):
     """
-    Version corrigée : supporte
+    sp.lambdify mis en cache. modules : 'numpy', 'mpmath', 'numexpr' ou
+    'iv' (arithmétique d'intervalles, cf. _FONCTIONS_IV).
+    """
+    expression = sp.sympify(expression)
+    cle = (expression, tuple(variables) if isinstance(variables, (list, tuple)) else variables, modules)
+    f = CACHE_LAMBDIFY.get(cle)
+    if f is None:
+        f = sp.lambdify(variables, expression, [_FONCTIONS_IV] if modules == 'iv' else modules)
+        CACHE_LAMBDIFY.set(cle, f)
+    return f
+
+
+def evaluer_terme(variable, expression, indices):
+    """
+    Évalue `expression` sur le tableau d'indices (cf. evaluer_vectorise), via un
+    noyau NumExpr pour les grandes grilles quand c'est possible.
+    """
+    if numexpr is not None and indices.size >= SEUIL_NUMEXPR:
+        try:
+            with np.errstate(all="ignore"):
+                valeurs = np.asarray(compiler(variable, expression, 'numexpr')(indices.astype(float)), dtype=float)
+            return np.broadcast_to(valeurs, indices.shape).astype(float)
+        except Exception:
+            pass
+    return evaluer_vectorise(compiler(variable, expression), indices)
+
+
+REPLI_MAX_TERMES = 2000      # termes évalués un à un quand l'expression n'est pas vectorisable
+REPLI_MAX_NON_FINIS = 50     # arrêt du repli après autant de valeurs non finies consécutives
+
+
+def evaluer_vectorise(f, indices):
+    """
+    Évalue la fonction lambdifiée f sur tout le tableau d'indices en un seul appel.
+    Si l'expression n'est pas vectorisable (factorial, ...), repli terme à terme
+    sur des entiers Python, limité aux REPLI_MAX_TERMES premiers indices (et arrêté
+    quand les valeurs ne sont plus finies). Les valeurs non calculables valent nan.
+    """
+    with np.errstate(all="ignore"):
+        try:
+            valeurs = np.asarray(f(indices.astype(float)), dtype=float)
+            return np.broadcast_to(valeurs, indices.shape).astype(float)
+        except Exception:
+            pass
+
+        valeurs = np.full(indices.shape, np.nan)
+        non_finis = 0
+        for i, j in enumerate(indices[:REPLI_MAX_TERMES].tolist()):
+            try:
+                valeurs[i] = float(f(j))
+            except Exception:
+                pass
+            non_finis = 0 if math.isfinite(valeurs[i]) else non_finis + 1
+            if non_finis >= REPLI_MAX_NON_FINIS:
+                break
+        return valeurs
+
+
+TAILLE_BLOC_COMPENSE = 1024
+
+
+def _cumul_compense(valeurs):
+    # Somme cumulée compensée par blocs : np.cumsum dans chaque bloc, décalé du total
+    # des blocs précédents (math.fsum par bloc, cumul Kahan-Babuška / Neumaier)
+    sommes = np.empty_like(valeurs)
+    s, c = 0.0, 0.0
+    for debut in range(0, len(valeurs), TAILLE_BLOC_COMPENSE):
+        bloc = valeurs[debut:debut + TAILLE_BLOC_COMPENSE]
+        with np.errstate(all="ignore"):
+            sommes[debut:debut + len(bloc)] = (s + c) + np.cumsum(bloc)
+            v = math.fsum(bloc.tolist()) if np.isfinite(bloc).all() else float(np.sum(bloc))
+        t = s + v
+        if abs(s) >= abs(v):
+            c += (s - t) + v
+        else:
+            c += (v - t) + s
+        s = t
+    return sommes
+
+
+def sommes_partielles(terme, variable, n_min, N_max, compense=False):
+    """
+    Sommes partielles S_N = sum_{j=n_min..N} terme(j) pour 0 <= N < N_max.
+    Le terme est évalué une seule fois sur tous les indices puis cumulé (O(N)).
+    compense=True : somme compensée, pour un résultat numérique exploité tel quel ;
+    inutile pour un tracé, où l'écart ne se voit pas à l'écran.
+    Renvoie (indices, sommes) ; une valeur non calculable rend nan les sommes suivantes.
+    """
+    n_min = int(n_min)
+    if N_max <= max(n_min, 0):
+        vide = np.arange(0)
+        return vide, vide.astype(float)
+
+    indices = np.arange(n_min, N_max)
+    valeurs = evaluer_terme(variable, terme, indices)
+
+    if compense:
+        sommes = _cumul_compense(valeurs)
+    else:
+        with np.errstate(all="ignore"):
+            sommes = np.cumsum(valeurs)
+
+    garde = indices >= 0
+    return indices[garde], sommes[garde]
+
+
+def evaluer_grille(expression, n, x, indices, abscisses):
+    """
+    Évalue expression(n, x) sur toute la grille indices × abscisses en un seul
+    appel NumPy (diffusion n[:, None], x[None, :]). Repli ligne par ligne (n entier
+    Python, x vectorisé) si l'expression ne se diffuse pas ; nan si non calculable.
+    """
+    f = compiler((n, x), expression)
+    forme = (indices.size, abscisses.size)
+    with np.errstate(all="ignore"):
+        try:
+            valeurs = np.asarray(f(indices.astype(float)[:, None], abscisses[None, :]), dtype=float)
+            return np.broadcast_to(valeurs, forme).astype(float)
+        except Exception:
+            pass
+
+        grille = np.full(forme, np.nan)
+        for i, j in enumerate(indices.tolist()):
+            try:
+                grille[i] = np.broadcast_to(np.asarray(f(j, abscisses), dtype=float), abscisses.shape)
+            except Exception:
+                pass
+        return grille
+
+
+def sommes_partielles_grille(terme, n, x, n_min, N_max, abscisses):
+    # S_N(x) = sum_{j=n_min..N} terme(j, x) : grille cumulée le long de n
+    indices = np.arange(int(n_min), N_max)
+    with np.errstate(all="ignore"):
+        return indices, np.cumsum(evaluer_grille(terme, n, x, indices, abscisses), axis=0)
+
+
+def ecarts_uniformes(grille, reference):
+    # sup_x |grille[n, x] - reference[x]| pour chaque n (points non calculables ignorés)
+    with np.errstate(all="ignore"):
+        ecarts = np.abs(grille - reference)
+    ecarts[~np.isfinite(ecarts)] = np.nan
+    valides = ~np.all(np.isnan(ecarts), axis=1)
+    sup = np.full(grille.shape[0], np.nan)
+    sup[valides] = np.nanmax(ecarts[valides], axis=1)
+    return sup
+
+
+def masque_domaine(domaine, indices, indecis=True):
+    """
+    Traduit une fois pour toutes l'ensemble SymPy `domaine` en masque booléen
+    sur le tableau d'indices (bornes et points exclus résolus numériquement).
+    Les ensembles non reconnus sont testés point par point ; un test indécidable
+    vaut `indecis` (True : on garde le point, le filtrage isfinite fait le reste).
+    """
+    x = indices.astype(float)
+
+    if domaine == S.Reals or domaine == S.Integers:
+        return np.ones(x.shape, dtype=bool)
+    if domaine == S.EmptySet:
+        return np.zeros(x.shape, dtype=bool)
+
+    try:
+        if isinstance(domaine, sp.Interval):
+            a, b = float(domaine.start), float(domaine.end)
+            gauche = (x > a) if domaine.left_open else (x >= a)
+            droite = (x < b) if domaine.right_open else (x <= b)
+            return gauche & droite
+
+        if isinstance(domaine, sp.Union):
+            masque = np.zeros(x.shape, dtype=bool)
+            for partie in domaine.args:
+                masque |= masque_domaine(partie, indices, indecis)
+            return masque
+
+        if isinstance(domaine, sp.Intersection):
+            masque = np.ones(x.shape, dtype=bool)
+            for partie in domaine.args:
+                masque &= masque_domaine(partie, indices, indecis)
+            return masque
+
+        if isinstance(domaine, sp.Complement):
+            A, B = domaine.args
+            return masque_domaine(A, indices, indecis) & ~masque_domaine(B, indices, not indecis)
+
+        if isinstance(domaine, sp.FiniteSet):
+            points = [float(p) for p in domaine.args if p.is_real]
+            return np.isin(x, points)
+
+        if isinstance(domaine, sp.ImageSet):
+            return _masque_image(domaine, x, indecis)
+    except (TypeError, ValueError):
+        pass
+
+    masque = np.full(x.shape, indecis, dtype=bool)
+    for i, N in enumerate(indices.tolist()):
+        appartient = domaine.contains(N)
+        if appartient is S.true:
+            masque[i] = True
+        elif appartient is S.false:
+            masque[i] = False
+    return masque
+
+
+def _masque_image(domaine, x, indecis):
+    """
+    ImageSet(Lambda(m, f(m)), Integers) (pôles de tan, cot, sec...) : résolu
+    numériquement si f est affine (N appartient à l'ensemble si (N - b) / a est
+    entier) ; sinon aucun test point par point (trop lent), le point vaut
+    `indecis` et le filtrage isfinite écarte les pôles effectivement atteints.
+    """
+    non_resolu = np.full(x.shape, indecis, dtype=bool)
+    if domaine.base_sets != (S.Integers,) or len(domaine.lamda.variables) != 1:
+        return non_resolu
+    m = domaine.lamda.variables[0]
+    try:
+        f = sp.Poly(domaine.lamda.expr, m)
+        if f.degree() != 1 or f.free_symbols - {m}:
+            return non_resolu
+        a, b = (complex(c) for c in f.all_coeffs())
+    except (sp.PolynomialError, TypeError, ValueError):
+        return non_resolu
+    if a.imag or b.imag or a.real == 0:
+        return non_resolu
+    q = (x - b.real) / a.real
+    return np.abs(q - np.round(q)) <= 1e-9 * np.maximum(1.0, np.abs(q))
+
+
+# ------------------------------------------------------------
+# Arithmétique d'intervalles (mpmath.iv) : encadrements numériques rigoureux
+# de la queue d'une série, par blocs dyadiques [2^j, 2^(j+1)[. Un nombre fini
+# de blocs ne dit rien de la nature de la série : seul un signe certain sert
+# (cf. test_comparaison).
+# ------------------------------------------------------------
+
+INTERVALLES = True                 # False : désactive le test de signe par blocs
+BLOCS_QUEUE = range(20, 41, 2)     # exposants j des blocs examinés
+
+_FONCTIONS_IV = {nom: getattr(iv, nom) for nom in
+                 ("exp", "log", "sqrt", "sin", "cos", "tan", "gamma", "factorial", "sign")}
+_FONCTIONS_IV.update({"Abs": abs, "pi": iv.pi, "E": iv.e})
+
+
+def _sommes_blocs(expression, n):
+    try:
+        f = compiler(n, expression, 'iv')
+        blocs = []
+        for j in BLOCS_QUEUE:
+            valeurs = f(iv.mpf([2**j, 2**(j + 1)]))
+            if not isinstance(valeurs, type(iv.mpf(0))):
+                valeurs = iv.mpf(valeurs)
+            somme = valeurs * 2**j
+            blocs.append((float(somme.a), float(somme.b)))
+        if not all(math.isfinite(inf) and math.isfinite(sup) for inf, sup in blocs):
+            return None
+        return blocs
+    except Exception:
+        return None
+
+
+def sommes_blocs_queue(expression, n):
+    """
+    Encadrements rigoureux (mpmath.iv) des sommes par blocs
+    B_j = sum_{2^j <= n < 2^(j+1)} u_n pour j dans BLOCS_QUEUE :
+    2^j * min(u) <= B_j <= 2^j * max(u) sur le bloc.
+    Renvoie la liste des (inf, sup), ou None si l'évaluation par intervalles échoue.
+    """
+    if not INTERVALLES:
+        return None
+    expression = sp.sympify(expression)
+    return _memoise(("blocs_iv", expression, n), lambda: _sommes_blocs(expression, n))
+
+
+# ------------------------------------------------------------
+# Rendu des graphes
+#   "png"    : image Agg (défaut), "svg" : image vectorielle,
+#   "points" : tableaux x / y en JSON, tracés côté navigateur
+#   "binaire": tableaux x / y en float32 (base64), tracés côté navigateur
+#   "aucun"  : pas de graphe (traitements par lots)
+# ------------------------------------------------------------
+
+FORMAT_GRAPHE = "png"
+FORMATS_GRAPHE = ("png", "svg", "points", "binaire", "aucun")
+DPI_GRAPHE = 80
+POINTS_MAX_GRAPHE = 2000      # au-delà, sous-échantillonnage avant le tracé
+POINTS_MAX_BINAIRE = 20000    # idem pour les tableaux binaires (tracé navigateur)
+
+# (graphe, variable, couleur, horizon, format, points max) → message
+CACHE_GRAPHES = CacheLRU(taille=128, ttl=None)
+
+_format_graphe = contextvars.ContextVar("format_graphe", default=None)
+
+
+def format_graphe_courant():
+    return _format_graphe.get() or FORMAT_GRAPHE
+
+
+@contextmanager
+def format_graphes(format=None):
+    # format des graphes pour la durée du bloc (format inconnu → FORMAT_GRAPHE)
+    jeton = _format_graphe.set(format if format in FORMATS_GRAPHE else None)
+    try:
+        yield
+    finally:
+        _format_graphe.reset(jeton)
+
+
+def sous_echantillonner(x, y, points_max=POINTS_MAX_GRAPHE):
+    # au plus points_max points régulièrement répartis (premier et dernier gardés)
+    if len(x) <= points_max:
+        return x, y
+    garde = np.unique(np.linspace(0, len(x) - 1, points_max).astype(int))
+    return x[garde], y[garde]
+
+
+def message_figure(fig, format="png"):
+    # rendu direct par le canevas Agg, sans l'état global de pyplot
+    if not isinstance(fig.canvas, FigureCanvasAgg):
+        FigureCanvasAgg(fig)
+    buf = io.BytesIO()
+    fig.savefig(buf, format=format)
+    b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
+    if format == "png":
+        return {"type": "plot", "content": b64}
+    return {"type": "plot", "format": format, "content": b64}
+
+
+def tableau_binaire(valeurs):
+    # float32 petit-boutiste, encodé en base64 (lu par un Float32Array côté client)
+    return base64.b64encode(np.asarray(valeurs, dtype="<f4").tobytes()).decode("ascii")
+
+
+def message_graphe(x_, y_, etiquette, c, format):
+    if format == "binaire":
+        # pas de Matplotlib : les données brutes suffisent au canevas du navigateur
+        x_, y_ = sous_echantillonner(x_, y_, POINTS_MAX_BINAIRE)
+        return {
+            "type": "plot",
+            "format": "binaire",
+            "content": {
+                "x": tableau_binaire(x_),
+                "y": tableau_binaire(y_),
+                "taille": int(len(x_)),
+                "label": etiquette,
+                "color": c,
+            },
+        }
+
+    x_, y_ = sous_echantillonner(x_, y_)
+
+    if format == "points":
+        return {
+            "type": "plot",
+            "format": "points",
+            "content": {"x": x_.tolist(), "y": y_.tolist(), "label": etiquette, "color": c},
+        }
+
+    fig = Figure(figsize=(8, 8), dpi=DPI_GRAPHE)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.scatter(x_, y_, color=c, label=r"$" + etiquette + "$")
+    ax.set_xlabel("n")
+    ax.set_ylabel("$" + etiquette + "$")
+    ax.legend()
+    fig.subplots_adjust(left=0.14, right=0.97, top=0.97, bottom=0.08)
+    return message_figure(fig, format)
+
+
+def points_graphe(u_n, n):
+    """
+    Points (x_, y_) tracés par graphe :
     - suite u_n
     - somme partielle S_n = Sum(...)
     """
@@ -330,49 +1274,43 @@ def graphe(u_n, n, c):
     except:
         domaine = S.Reals
 
-    x_ = []
-    y_ = []
-
     # Cas Sum : on calcule numériquement S_N = sum_{j=n_min..N} expr(j)
     if isinstance(u_n, sp.Sum):
         expr = u_n.function
         lims = u_n.limits[0]     # (k, n_min, n)
         kk, n_min, _ = lims[0], lims[1], lims[2]
 
-        f = sp.lambdify(kk, expr, 'numpy')
-
-        for N in range(0, 400):
-            if domaine.contains(N):
-                try:
-                    if N < int(n_min):
-                        continue
-                    s = 0.0
-                    for j in range(int(n_min), N + 1):
-                        s += float(f(j))
-                    x_.append(N)
-                    y_.append(s)
-                except: 
-                    pass
-
-    # Cas suite simple
+        indices, y = sommes_partielles(expr, kk, n_min, HORIZON_SOMMES)
+
+    # Cas suite simple : une seule évaluation vectorisée
     else:
-        u = sp.lambdify(n, u_n, 'numpy')
-        for N in range(0, 1500):
-            if domaine.contains(N):
-                try:
-                    yk = float(u(N))
-                    x_.append(N)
-                    y_.append(yk)
-                except:
-                    pass
-
-    fig, ax = plt.subplots(figsize=(8, 8))
-    ax.scatter(x_, y_, color=c, label=r"$" + sp.latex(u_n) + "$")
-    ax.set_xlabel("n")
-    ax.set_ylabel("$" + sp.latex(u_n) + "$")
-    ax.legend()
+        indices = np.arange(0, HORIZON_SUITE)
+        y = evaluer_terme(n, u_n, indices)
+
+    garde = masque_domaine(domaine, indices) & np.isfinite(y)
+    return indices[garde], y[garde]
+
+
+def graphe(u_n, n, c):
+    """
+    Version corrigée : supporte
+    - suite u_n
+    - somme partielle S_n = Sum(...)
+    Le message produit est mis en cache par (expression, horizon, style, format).
+    """
+    format = format_graphe_courant()
+    if format == "aucun":
+        return
+    horizon = HORIZON_SOMMES if isinstance(u_n, sp.Sum) else HORIZON_SUITE
+    cle = (u_n, n, c, horizon, format, POINTS_MAX_GRAPHE)
 
-    st.pyplot(fig)
+    message = CACHE_GRAPHES.get(cle)
+    if message is None:
+        x_, y_ = points_graphe(u_n, n)
+        message = message_graphe(x_, y_, sp.latex(u_n), c, format)
+        CACHE_GRAPHES.set(cle, message)
+
+    st.graphe(message)
 
 
 def positivite(u_n, n, n_min):
@@ -389,12 +1327,12 @@ def positivite(u_n, n, n_min):
                 relational=False,
                 domain=S.Reals.intersect(sp.Interval(n_min, sp.oo))
             )
-            resultat = (u_n.is_nonnegative or (pos != sp.EmptySet))
+            resultat = (est(u_n, "nonnegative") or (pos != sp.EmptySet))
             if resultat is True:
                 msg = r"\text{La suite } \left( " + sp.latex(u_n) + r" \right)_{ n \in \mathbb{N}} \text{ est bien toujours positive pour tout } n \geq " + sp.latex(n_min)
                 return True, msg
         except:
-            resultat = u_n.is_nonnegative
+            resultat = est(u_n, "nonnegative")
 
             if resultat is True:
                 msg = r"\text{La suite } \left( " + sp.latex(u_n) + r" \right)_{ n \in \mathbb{N}} \text{ est bien toujours positive pour tout n}"
@@ -411,90 +1349,157 @@ def facteur(expression):
     return facteur
 
 
-def decroissance(a_n, n):
-    try:
-        a_n1 = a_n.subs(n, n + 1)
-        diff = sp.diff(a_n, n)
-        delta = sp.simplify(a_n1 - a_n)
-        lim_diff = sp.limit_seq(diff, n)
-        quot = sp.simplify(a_n1 / a_n)
+class _ElementsDecroissance:
+    # éléments de preuve de la décroissance, calculés à la demande (une fois chacun)
 
-        if delta.is_nonpositive is True:
-            msg = (r"\left(" + sp.latex(a_n) + r"\right)_{n \in \mathbb{N}}"
-                   r"\text{ est décroissante , en effet : } \forall n \in \mathbb {N}  , a_{n+1} - a_n  = "
-                   + sp.latex(a_n1) + " - " + sp.latex(a_n) + " =" + sp.latex(delta) + r"\le 0 ")
-            return True, msg
+    def __init__(self, a_n, n):
+        self.a_n = a_n
+        self.n = n
+        self.x = sp.symbols('x', real=True)
 
-        if (sp.simplify(quot - 1)).is_nonpositive and a_n.is_nonnegative:
-            msg = "(" + sp.latex(a_n) + r")_{n \in \mathbb{N}}"
-            msg += r"\text{ est décroissante , en effet :  }  \forall n \in \mathbb {N}  , \frac{a_{n+1}}{a_n}  = "
-            msg += sp.latex(quot) + r"\le 1 "
-            return True, msg
+    @cached_property
+    def a_n1(self):
+        return self.a_n.subs(self.n, self.n + 1)
 
-        if diff.is_nonpositive:
-            msg = r"\left(" + sp.latex(a_n) + r"\right)_{n \in \mathbb{N}} \text{ est décroissante, en effet : } "
-            msg += r"\text{considérons } f(n) = " + sp.latex(a_n) + r", \text{ on a } f'(n) = " + sp.latex(diff) + r" \le 0"
-            return True, msg
+    @cached_property
+    def diff(self):
+        return sp.diff(self.a_n, self.n)
 
-        else:
-            try:
-                x = sp.symbols('x', real=True)
-                diffx = diff.subs(n, x)
-
-                negative = sp.solve_univariate_inequality(diffx <= 0, x, relational=False)
-                derivable = continuous_domain(diffx, x, domain=S.Reals)
-                negative2 = derivable.intersect(negative)
-
-                if lim_diff.is_negative:
-                    if derivable.sup == sp.oo:
-                        msg = (
-                            r"Soit la suite définie par \( a_n = " + sp.latex(a_n) + r"\) pour \( n \in \mathbb{N}^* \). "
-                            r"La suite \( \left(a_n\right)_{n \in \mathbb{N}^*} \) est décroissante à partir d'un certain rang. En effet :\\"
-                            r"Considérons la fonction \( f \) définie par \( f(n) = a_n \).\\"
-                            r"La fonction \( f \) est dérivable sur " + sp.latex(derivable) + r", et l'on a :\\"
-                            r"\( f'(n) = " + sp.latex(diff) + r", \quad \lim\limits_{n \to \infty} f'(n) = " + sp.latex(lim_diff) + r" \leq 0 \)."
-                        )
-                        return True, msg
-
-                if negative2.sup == sp.oo and negative2 != EmptySet:
-                    msg = (
-                        r"\text{Soit la suite définie par } a_n = " + sp.latex(a_n) + r" \text{ pour } n \in \mathbb{N}^*.\\"
-                        r"\text{La suite } \left(a_n\right)_{n \in \mathbb{N}^*} \text{ est décroissante à partir d'un certain rang. En effet :}\\"
-                        r"\text{On considère la fonction } f : \mathbb{R} \to \mathbb{R} \text{ définie par } f(x) = " + sp.latex(a_n.subs(n, x)) + r".\\"
-                        r"\text{On a } f(n) = a_n. \text{ La fonction } f \text{ est dérivable sur } " + sp.latex(derivable) + r", \text{ et sa dérivée vaut :}\\"
-                        r"f'(n) = " + sp.latex(diff) + r", \text{ donc } f'(n) \leq 0 \text{ pour } n \in " + sp.latex(negative2) + r".\\"
-                        r"\text{Il existe donc un rang } N \in \mathbb{N} \text{ tel que pour tout } n \geq N, \ a_{n+1} - a_n < 0."
-                    )
-                    return True, msg
+    @cached_property
+    def delta(self):
+        return simplifier(self.a_n1 - self.a_n)
 
-            except:
-                pass
+    @cached_property
+    def quot(self):
+        return simplifier(self.a_n1 / self.a_n)
 
-    except Exception as e:
-        msg = f"Détail technique (décroissance) : {e}"
-        return None, msg
+    @cached_property
+    def lim_diff(self):
+        return limite_suite(self.diff, self.n)
 
-    return False, None
+    @cached_property
+    def diffx(self):
+        return self.diff.subs(self.n, self.x)
 
+    @cached_property
+    def derivable(self):
+        return continuous_domain(self.diffx, self.x, domain=S.Reals)
 
-def identif_fonction_log(expression, variable):
-    log_bool = False
-    n_bool = False
-    dictionnaire_fonctions = expression.as_powers_dict()
-    for fonction in dictionnaire_fonctions:
-        if not ((fonction - variable).equals(0)) and not fonction.has(sp.log):
-            return False
-        if (fonction - variable).equals(0):
-            n_bool = True
-        if (fonction.has(sp.log)):
-            log_bool = True
-    return n_bool and log_bool
 
+def _decroissance_difference(e):
+    if e.delta.is_nonpositive is True:
+        return (r"\left(" + sp.latex(e.a_n) + r"\right)_{n \in \mathbb{N}}"
+                r"\text{ est décroissante , en effet : } \forall n \in \mathbb {N}  , a_{n+1} - a_n  = "
+                + sp.latex(e.a_n1) + " - " + sp.latex(e.a_n) + " =" + sp.latex(e.delta) + r"\le 0 ")
+    return None
 
-def detecte_alternance(expression, symbole):
-    for puissance in expression.atoms(sp.Pow):
-        base, exposant = puissance.args
-        if base == -1 and exposant.has(symbole):
+
+def _decroissance_quotient(e):
+    if (simplifier(e.quot - 1)).is_nonpositive and e.a_n.is_nonnegative:
+        msg = "(" + sp.latex(e.a_n) + r")_{n \in \mathbb{N}}"
+        msg += r"\text{ est décroissante , en effet :  }  \forall n \in \mathbb {N}  , \frac{a_{n+1}}{a_n}  = "
+        msg += sp.latex(e.quot) + r"\le 1 "
+        return msg
+    return None
+
+
+def _decroissance_derivee(e):
+    if e.diff.is_nonpositive:
+        msg = r"\left(" + sp.latex(e.a_n) + r"\right)_{n \in \mathbb{N}} \text{ est décroissante, en effet : } "
+        msg += r"\text{considérons } f(n) = " + sp.latex(e.a_n) + r", \text{ on a } f'(n) = " + sp.latex(e.diff) + r" \le 0"
+        return msg
+    return None
+
+
+def _decroissance_derivee_infini(e):
+    # une erreur sur la limite de f' est remontée (détail technique), comme avant
+    lim_diff = e.lim_diff
+    try:
+        if lim_diff.is_negative and e.derivable.sup == sp.oo:
+            return (
+                r"Soit la suite définie par \( a_n = " + sp.latex(e.a_n) + r"\) pour \( n \in \mathbb{N}^* \). "
+                r"La suite \( \left(a_n\right)_{n \in \mathbb{N}^*} \) est décroissante à partir d'un certain rang. En effet :\\"
+                r"Considérons la fonction \( f \) définie par \( f(n) = a_n \).\\"
+                r"La fonction \( f \) est dérivable sur " + sp.latex(e.derivable) + r", et l'on a :\\"
+                r"\( f'(n) = " + sp.latex(e.diff) + r", \quad \lim\limits_{n \to \infty} f'(n) = " + sp.latex(lim_diff) + r" \leq 0 \)."
+            )
+    except:
+        pass
+    return None
+
+
+def _decroissance_inegalite(e):
+    try:
+        negative = sp.solve_univariate_inequality(e.diffx <= 0, e.x, relational=False)
+        negative2 = e.derivable.intersect(negative)
+
+        if negative2.sup == sp.oo and negative2 != EmptySet:
+            return (
+                r"\text{Soit la suite définie par } a_n = " + sp.latex(e.a_n) + r" \text{ pour } n \in \mathbb{N}^*.\\"
+                r"\text{La suite } \left(a_n\right)_{n \in \mathbb{N}^*} \text{ est décroissante à partir d'un certain rang. En effet :}\\"
+                r"\text{On considère la fonction } f : \mathbb{R} \to \mathbb{R} \text{ définie par } f(x) = " + sp.latex(e.a_n.subs(e.n, e.x)) + r".\\"
+                r"\text{On a } f(n) = a_n. \text{ La fonction } f \text{ est dérivable sur } " + sp.latex(e.derivable) + r", \text{ et sa dérivée vaut :}\\"
+                r"f'(n) = " + sp.latex(e.diff) + r", \text{ donc } f'(n) \leq 0 \text{ pour } n \in " + sp.latex(negative2) + r".\\"
+                r"\text{Il existe donc un rang } N \in \mathbb{N} \text{ tel que pour tout } n \geq N, \ a_{n+1} - a_n < 0."
+            )
+    except:
+        pass
+    return None
+
+
+# Arguments de décroissance, du moins coûteux au plus coûteux
+PREUVES_DECROISSANCE = [
+    ("différence", _decroissance_difference),
+    ("quotient", _decroissance_quotient),
+    ("dérivée", _decroissance_derivee),
+    ("dérivée à l'infini", _decroissance_derivee_infini),
+    ("inégalité", _decroissance_inegalite),
+]
+
+
+def decroissance(a_n, n, temps=None):
+    """
+    Essaie les preuves de PREUVES_DECROISSANCE dans l'ordre ; chaque élément
+    (a_{n+1}, f', limites, ...) n'est calculé que si une preuve en a besoin.
+    temps : dictionnaire optionnel rempli avec la durée (s) de chaque preuve tentée.
+    """
+    elements = _ElementsDecroissance(a_n, n)
+    try:
+        for nom, preuve in PREUVES_DECROISSANCE:
+            debut = time.perf_counter()
+            try:
+                msg = preuve(elements)
+            finally:
+                if temps is not None:
+                    temps[nom] = time.perf_counter() - debut
+            if msg is not None:
+                return True, msg
+
+    except Exception as e:
+        msg = f"Détail technique (décroissance) : {e}"
+        return None, msg
+
+    return False, None
+
+
+def identif_fonction_log(expression, variable):
+    log_bool = False
+    n_bool = False
+    dictionnaire_fonctions = expression.as_powers_dict()
+    for fonction in dictionnaire_fonctions:
+        if not ((fonction - variable).equals(0)) and not fonction.has(sp.log):
+            return False
+        if (fonction - variable).equals(0):
+            n_bool = True
+        if (fonction.has(sp.log)):
+            log_bool = True
+    return n_bool and log_bool
+
+
+def detecte_alternance(expression, symbole):
+    for puissance in expression.atoms(sp.Pow):
+        base, exposant = puissance.args
+        if base == -1 and exposant.has(symbole):
             return True
     return False
 
@@ -504,47 +1509,153 @@ def extraire_partie_positive(expression, symbole, debut):
         base, exposant = puissance.args
         if base == -1 and exposant.has(symbole):
             quotient = expression / puissance
-            if quotient.is_nonnegative or positivite(quotient, symbole, debut)[0]:
-                return sp.simplify(quotient)
-            elif quotient.is_nonpositive:
-                return sp.simplify(-quotient)
+            if est(quotient, "nonnegative") or positivite(quotient, symbole, debut)[0]:
+                return simplifier(quotient)
+            elif est(quotient, "nonpositive"):
+                return simplifier(-quotient)
             else:
                 return None
 
 
+# ------------------------------------------------------------
+# Développements asymptotiques en 1/n, mis en cache par terme
+# L'ordre monte (ORDRES_DL) seulement jusqu'à obtenir un terme principal non nul ;
+# un appel ultérieur repart du développement déjà calculé.
+# ------------------------------------------------------------
+
+ORDRES_DL = (2, 4, 8, 16)
+
+# (terme, variable) → (ordre, développement en x = 1/n avec son O(x**ordre))
+CACHE_DEVELOPPEMENTS = CacheLRU(taille=1024, ttl=None)
+
+_X_DL = sp.Dummy("x", positive=True)
+
+
+def developper(u_n, n, ordre):
+    """
+    Développement de u_n en x = 1/n à l'ordre `ordre` au moins (série SymPy en _X_DL).
+    Réutilise le développement en cache s'il est assez précis, sinon le recalcule
+    à l'ordre demandé et remplace l'entrée.
+    """
+    u_n = sp.sympify(u_n)
+    entree = CACHE_DEVELOPPEMENTS.get((u_n, n))
+    if entree is not None and entree[0] >= ordre:
+        return entree[1]
+
+    serie = sp.series(u_n.subs(n, 1 / _X_DL), _X_DL, 0, ordre)
+    CACHE_DEVELOPPEMENTS.set((u_n, n), (ordre, serie))
+    return serie
+
+
+def developpement_asymptotique(u_n, n):
+    """
+    (ordre, développement, terme principal en n) avec le plus petit ordre de
+    ORDRES_DL (à partir de celui déjà en cache) donnant une partie principale
+    non nulle ; None si aucun ordre ne suffit.
+    """
+    u_n = sp.sympify(u_n)
+    entree = CACHE_DEVELOPPEMENTS.get((u_n, n))
+    deja = entree[0] if entree is not None else 0
+
+    for ordre in [o for o in ORDRES_DL if o >= deja] or [deja]:
+        serie = developper(u_n, n, ordre)
+        partie_reguliere = serie.removeO()
+        if partie_reguliere != 0:
+            principal = partie_reguliere.as_leading_term(_X_DL).subs(_X_DL, 1 / n)
+            return ordre, serie, principal
+    return None
+
+
 def dl(u_n, n):
     try:
-        x = sp.symbols('x')
-        u_x = u_n.subs(n, 1 / x)
-        dl_x = sp.series(u_x, x, 0, 10)
-        dl_n = sp.simplify(dl_x.subs(x, 1 / n))
-        dl = dl_x.as_leading_term(x).subs(x, 1 / n)
+        with mesurer("dl"):
+            resultat = developpement_asymptotique(u_n, n)
+        if resultat is None:
+            return None
+        ordre, serie, dl = resultat
 
-        if sp.simplify(dl) == sp.simplify(u_n):
+        if simplifier(dl) == simplifier(u_n):
             return None
 
-        st.latex(r"\text{Développement limité de } " + sp.latex(u_n) + r" \text{ en } \frac{1}{n} \text{ à l'ordre 2 autour de 0 : } ")
-        st.latex(sp.latex(u_n) + "=" + sp.latex(dl_n) + r"\Longrightarrow" + sp.latex(u_n) + r"\sim " + sp.latex(dl) + r"\text { à l'infini }")
+        st.latex(r"\text{Développement limité de } " + sp.latex(u_n) + r" \text{ en } \frac{1}{n} \text{ à l'ordre " + str(ordre) + r" autour de 0 : } ")
+        st.latex(sp.latex(u_n) + "=" + sp.latex(serie.subs(_X_DL, 1 / n)) + r"\Longrightarrow" + sp.latex(u_n) + r"\sim " + sp.latex(dl) + r"\text { à l'infini }")
         return dl
     except:
         return None
 
 
+# Rangs n = 10**j d'échantillonnage du pré-test numérique de divergence grossière
+EXPOSANTS_PRE_TEST = (2, 4, 6, 8)
+
+
+def _echantillons_divergence(u_n, n):
+    try:
+        f = compiler(n, u_n, 'mpmath')
+        with mpmath.workdps(30):
+            valeurs = [f(mpmath.mpf(10)**j) for j in EXPOSANTS_PRE_TEST]
+            modules = [abs(v) for v in valeurs]
+        if not all(isinstance(m, mpmath.mpf) and mpmath.isfinite(m) for m in modules):
+            return None
+    except Exception:
+        return None
+
+    m1, m2, m3, m4 = modules
+    croissant = m1 < m2 < m3 < m4 and m4 >= 1
+    stabilise = m4 >= 1e-3 and abs(m4 - m3) <= 1e-6 * m4 and abs(m3 - m2) >= abs(m4 - m3)
+    if croissant or stabilise:
+        return [(j, mpmath.nstr(v, 8)) for j, v in zip(EXPOSANTS_PRE_TEST, valeurs)], not stabilise
+    return None
+
+
+def divergence_numerique(u_n, n):
+    """
+    Pré-test rapide (mpmath, 30 chiffres) : |u_n| évalué en n = 10^2, ..., 10^8.
+    Renvoie les échantillons si |u_n| croît nettement ou se stabilise loin de 0,
+    None sinon. Simple indice : une fenêtre finie ne prouve rien sur la limite.
+    """
+    u_n = sp.sympify(u_n)
+    return _memoise(("divergence_numerique", u_n, n), lambda: _echantillons_divergence(u_n, n))
+
+
+def ne_tend_pas_vers_zero(lim):
+    # limite inexistante (None), non nulle, ou plusieurs valeurs d'adhérence
+    if lim is None or isinstance(lim, sp.AccumBounds):
+        return True
+    return lim.is_zero is False
+
+
 def diverge(u_n, n):
+    """
+    True si la limite symbolique prouve que u_n ne tend pas vers 0, False si u_n → 0
+    ou s'il faut passer aux critères, None si l'on s'arrête sans conclure.
+    L'évaluation numérique n'est lancée que si la limite n'a pas pu être établie :
+    simple indice, elle décide alors de s'arrêter (None) plutôt que de lancer les
+    critères (False).
+    """
     try:
-        lim = sp.limit_seq(u_n, n)
-        if lim is None:
-            st.latex(r"\lim_{n \to \infty} " + sp.latex(u_n) + r" \text{ n'existe pas.}")
-            return True
-        if lim.is_zero is True:
-            return False
-        elif lim.is_zero is False:
-            return True
-        else:
-            return True
+        lim = limite_suite(u_n, n)
     except Exception as e:
         st.info(f"Détail technique : {e}")
+        lim = _ABSENT
+
+    if lim is not _ABSENT and ne_tend_pas_vers_zero(lim):
+        if lim is None or isinstance(lim, sp.AccumBounds):
+            st.latex(r"\lim_{n \to \infty} " + sp.latex(u_n) + r" \text{ n'existe pas.}")
+        else:
+            st.latex(r"\lim_{n \to \infty}" + sp.latex(u_n) + " = " + sp.latex(lim) + r"\neq 0")
         return True
+    if lim is not _ABSENT and lim.is_zero is True:
+        return False
+
+    indice = divergence_numerique(u_n, n)
+    if indice is not None:
+        echantillons, _ = indice
+        valeurs = r", \ ".join(r"u_{10^{" + str(j) + r"}} \approx " + v for j, v in echantillons)
+        st.latex(r"\text{Évaluation numérique : } " + valeurs)
+        st.info("La limite de u_n n'a pas pu être établie : l'évaluation numérique suggère "
+                "qu'elle n'est pas nulle, sans le prouver.")
+        return None
+    return False
 
 
 def prepare_Riemann(expression, n):
@@ -564,6 +1675,19 @@ def prepare_Riemann(expression, n):
     return num, dict
 
 
+def conclusion_Riemann(s, n, S_n):
+    if s > 1:
+        st.latex(r"\text{Puisque } " + sp.latex(s) + r" > 1, \quad \sum " + sp.latex(1 / n**s) +
+                 r" \text{ converge par le critère de Riemann . Donc la série de somme partielle }" +
+                 sp.latex(S_n) + r"\text{ aussi }")
+        return True
+    else:
+        st.latex(r"\text{Puisque } " + sp.latex(s) + r" \leq 1, \quad \sum " + sp.latex(1 / n**s) +
+                 r" \text{ diverge par le critère de Riemann .Donc la série de somme partielle}" +
+                 sp.latex(S_n) + r"\text{ aussi }")
+        return False
+
+
 def test_Riemann(u_n, n, n_min):
     S_n = sp.Sum(u_n.subs(n, k), (k, n_min, n))
     P = prepare_Riemann(u_n, n)
@@ -572,31 +1696,25 @@ def test_Riemann(u_n, n, n_min):
     else:
         num, dict = P
         if int(num) == 1 and len(dict) == 1 and list(dict.keys())[0] == n:
-            s = dict[n]
-            if s > 1:
-                st.latex(r"\text{Puisque } " + sp.latex(s) + r" > 1, \quad \sum " + sp.latex(1 / n**s) +
-                         r" \text{ converge par le critère de Riemann . Donc la série de somme partielle }" +
-                         sp.latex(S_n) + r"\text{ aussi }")
-                return True
-            else:
-                st.latex(r"\text{Puisque } " + sp.latex(s) + r" \leq 1, \quad \sum " + sp.latex(1 / n**s) +
-                         r" \text{ diverge par le critère de Riemann .Donc la série de somme partielle}" +
-                         sp.latex(S_n) + r"\text{ aussi }")
-                return False
+            return conclusion_Riemann(dict[n], n, S_n)
     return None
 
 
 def test_Leibniz(u_n, n, n_min):
     S_n = sp.Sum(u_n.subs(n, k), (k, n_min, n))
 
-    if (detecte_alternance(sp.simplify(u_n), n)) or (detecte_alternance(sp.simplify(u_n), n + 1)):
+    u_s = simplifier(u_n)
+    if (detecte_alternance(u_s, n)) or (detecte_alternance(u_s, n + 1)):
         a_n = extraire_partie_positive(u_n, n, n_min)
         if a_n is None:
             return None
 
         p, affichage_p = positivite(a_n, n, n_min)
-        l = sp.limit_seq(a_n, n)
-        d, affichage_d = decroissance(a_n, n)
+        l = limite_suite(a_n, n)
+        temps = {}
+        d, affichage_d = decroissance(a_n, n, temps)
+        for preuve, duree in temps.items():
+            noter_duree(f"décroissance/{preuve}", duree)
 
         if p and d and (l == 0):
             st.latex(affichage_p)
@@ -613,7 +1731,7 @@ def test_Leibniz(u_n, n, n_min):
 
 def test_bertrand(u_n, n, n_min):
     S_n = sp.Sum(u_n.subs(n, k), (k, n_min, n))
-    u_n = sp.simplify(u_n)
+    u_n = simplifier(u_n)
 
     v_n = u_n / facteur(u_n)
     numerateur, denominateur = v_n.as_numer_denom()
@@ -665,18 +1783,23 @@ def test_bertrand(u_n, n, n_min):
 def test_Alembert(u_n, n, n_min):
     S_n = sp.Sum(u_n.subs(n, k), (k, n_min, n))
     u_n1 = u_n.subs(n, n + 1)
-    if u_n.is_nonnegative:
+    if est(u_n, "nonnegative"):
         st.latex(positivite(u_n, n, n_min)[1])
         if u_n != 0:
-            quotient = sp.simplify(sp.Abs(u_n1 / u_n))
-            L = sp.limit(quotient, n, sp.oo)
+            quotient = simplifier(sp.Abs(u_n1 / u_n))
+            try:
+                L = limite(quotient, n)
+                inferieur, superieur = bool(L < 1), bool(L > 1)
+            except (NotImplementedError, ValueError, TypeError):
+                # limite du quotient introuvable ou non comparable à 1 (ex. |sin|) : pas de conclusion
+                return None
 
-            if L < 1:
+            if inferieur:
                 st.latex(r"\text{En effet }\lim_{n \to \infty} \left| {\frac{u_{n+1}}{u_n}} \right| = "
                          + r"\lim_{n \to \infty}" + sp.latex(quotient) + "=" + sp.latex(L) + r"\text { <  1}")
                 st.latex(r"\text {La série de somme partielle }" + sp.latex(S_n) + r"\text { converge donc par le critère d'Alembert}")
                 return True
-            if L > 1:
+            if superieur:
                 st.latex(r"\text{En effet }\lim_{n \to \infty} \left| {\frac{u_{n+1}}{u_n}} \right|  = "
                          + r"\lim_{n \to \infty}" + sp.latex(quotient) + "=" + sp.latex(L) + r"\text { >  1}")
                 st.latex(r"\text {La série de somme partielle }" + sp.latex(S_n) + r"\text{ diverge donc par le critère d'Alembert}")
@@ -689,7 +1812,7 @@ def test_equivalence(u_n, n, n_min):
     equivalent = dl(u_n, n)
 
     if equivalent is not None:
-        if not sp.simplify(u_n - equivalent).equals(0):
+        if not simplifier(u_n - equivalent).equals(0):
             try:
                 C = critere(equivalent, n, n_min)
                 if C is True:
@@ -708,7 +1831,7 @@ def test_comparaison(u_n, n, n_min):
 
     # Cas spécial : 1 / (log(n))^a  → toujours divergent par comparaison avec 1/n
     try:
-        num, den = sp.simplify(u_n).as_numer_denom()
+        num, den = simplifier(u_n).as_numer_denom()
         if num == 1:
             # 1/log(n)
             if den == sp.log(n):
@@ -738,41 +1861,61 @@ def test_comparaison(u_n, n, n_min):
     except:
         pass
 
+    # u_n certainement < 0 sur un bloc de la queue : aucun minorant positif possible
+    blocs = sommes_blocs_queue(u_n, n)
+    if blocs is not None and any(sup < 0 for inf, sup in blocs):
+        return None
+
     # Encadrement classique sinon
     a, b = encadrements(u_n, n)
     min_un = min_borne(a, b)
     max_un = max_borne(a, b)
 
-    if not min_un.is_nonnegative:
+    if not est(min_un, "nonnegative"):
         return None
 
-    # Comparaison par majoration
-    try:
-        test_sup = critere(max_un, n, n_min)
-        if test_sup is True:
+    # Les messages d'une comparaison qui échoue sont écartés (délais dépassés exceptés)
+    def comparer(borne, attendu):
+        messages = []
+        jeton = st.set_out(messages)
+        try:
+            verdict = critere(borne, n, n_min)
+        except:
+            verdict = None
+        finally:
+            st.reset_out(jeton)
+        if verdict is attendu:
+            st._out.extend(messages)
+            return True
+        st._out.extend(m for m in messages if m["type"] == "timeout")
+        return False
+
+    def majoration():
+        if comparer(max_un, True):
             st.latex(
                 r"\text{Comme } " + sp.latex(u_n) + r" \le " + sp.latex(max_un) +
                 r"\text{ et que la série de référence converge, alors } "
                 + sp.latex(S_n) + r"\text{ converge.}"
             )
             return True
-    except:
-        pass
+        return None
 
-    # Comparaison par minoration
-    try:
-        test_inf = critere(min_un, n, n_min)
-        if test_inf is False:
+    def minoration():
+        if comparer(min_un, False):
             st.latex(
                 r"\text{Comme } " + sp.latex(u_n) + r" \ge " + sp.latex(min_un) +
                 r"\text{ et que la série de référence diverge, alors } "
                 + sp.latex(S_n) + r"\text{ diverge.}"
             )
             return False
-    except:
-        pass
+        return None
+
+    verdict = majoration()
+    if verdict is None:
+        verdict = minoration()
+    return verdict
+
 
-    return None
 def convergence_absolue(u_n, n, n_min):
     # On teste seulement les critères simples sur |u_n|
     v_n = sp.Abs(u_n)
@@ -799,54 +1942,863 @@ def convergence_absolue(u_n, n, n_min):
     return None
 
 
+# Termes en cours d'étude par critere (propres à chaque requête / thread)
+_critere_visites = contextvars.ContextVar("critere_visites", default=frozenset())
+
+
+def cle_canonique(expression):
+    # Clé de hachage canonique d'une expression : forme simplifiée sérialisée
+    # (forme saisie si la simplification dépasse son budget)
+    return sp.srepr(simplifier_borne(expression))
+
+
+# Bilan d'une analyse (nature trouvée, critère décisif), rempli au fil de l'étude
+_bilan = contextvars.ContextVar("bilan", default=None)
+
+NATURES = {True: "converge", False: "diverge"}
+
+
+@contextmanager
+def bilan_analyse(bilan=None):
+    bilan = {} if bilan is None else bilan
+    bilan.update(nature=None, critere=None)
+    jeton = _bilan.set(bilan)
+    try:
+        yield bilan
+    finally:
+        _bilan.reset(jeton)
+
+
+def noter_bilan(**infos):
+    bilan = _bilan.get()
+    if bilan is not None:
+        bilan.update(infos)
+
+
+# ------------------------------------------------------------
+# Voie rapide : formes usuelles reconnues par filtrage (Wild), sans simplification
+#   c * n**p * log(n)**q * r**n   (Riemann, Bertrand, géométrique, alternée, n**p r**n)
+# ------------------------------------------------------------
+
+def decomposer_forme_usuelle(u_n, n):
+    """
+    Décompose u_n = c * n**p * log(n)**q * r**n (c, p, q, r constantes numériques
+    réelles) en un seul passage sur ses facteurs. Renvoie (c, p, q, r) ou None.
+    """
+    a = sp.Wild('a', exclude=[n])
+    b = sp.Wild('b', exclude=[n])
+    r = sp.Wild('r', exclude=[n])
+
+    c, p, q, raison = sp.S.One, sp.S.Zero, sp.S.Zero, sp.S.One
+    for f in sp.Mul.make_args(u_n):
+        if not f.has(n):
+            c *= f
+            continue
+
+        m = f.match(n**a)
+        if m is not None:
+            p += m[a]
+            continue
+
+        m = f.match(sp.log(n)**b)
+        if m is not None:
+            q += m[b]
+            continue
+
+        m = f.match(r**(a * n + b))
+        if m is not None and m[a] != 0:
+            raison *= m[r]**m[a]
+            c *= m[r]**m[b]
+            continue
+
+        return None
+
+    for valeur in (c, p, q, raison):
+        if not (valeur.is_number and valeur.is_real):
+            return None
+    if c.is_zero:
+        return None
+    return c, p, q, raison
+
+
+def _bertrand_converge(alpha, beta):
+    # sum 1/(n**alpha * log(n)**beta) converge ssi alpha > 1 ou (alpha = 1 et beta > 1)
+    return bool(alpha > 1) or (bool(sp.Eq(alpha, 1)) and bool(beta > 1))
+
+
+def test_formes_usuelles(u_n, n, n_min):
+    forme = decomposer_forme_usuelle(u_n, n)
+    if forme is None:
+        return None
+
+    c, p, q, raison = forme
+    S_n = sp.Sum(u_n.subs(n, k), (k, n_min, n))
+    alpha, beta = -p, -q
+    terme = n**p * sp.log(n)**q
+
+    try:
+        # r**n avec |r| != 1 : d'Alembert
+        if abs(raison) != 1:
+            L = abs(raison)
+            if L < 1:
+                st.latex(r"\text{En effet }\lim_{n \to \infty} \left| {\frac{u_{n+1}}{u_n}} \right| = "
+                         + sp.latex(L) + r"\text { <  1}")
+                st.latex(r"\text {La série de somme partielle }" + sp.latex(S_n) + r"\text { converge donc par le critère d'Alembert}")
+                return True
+            st.latex(r"\text{En effet }\lim_{n \to \infty} \left| {\frac{u_{n+1}}{u_n}} \right|  = "
+                     + sp.latex(L) + r"\text { >  1}")
+            st.latex(r"\text {La série de somme partielle }" + sp.latex(S_n) + r"\text{ diverge donc par le critère d'Alembert}")
+            return False
+
+        # terme de signe constant : Riemann / Bertrand
+        if raison == 1:
+            if c != 1:
+                st.latex(sp.latex(u_n) + "=" + sp.latex(c) + r"\cdot " + sp.latex(terme)
+                         + r"\text{ : même nature que } \sum " + sp.latex(terme))
+            if q == 0:
+                return conclusion_Riemann(alpha, n, S_n)
+
+            verdict = _bertrand_converge(alpha, beta)
+            st.latex(r"\text{Puisque } u_n = " + sp.latex(u_n) + r" \text{ avec } \alpha = " + sp.latex(alpha)
+                     + r", \ \beta = " + sp.latex(beta) + r", \text{ la série } " + sp.latex(S_n)
+                     + (r"\text{ converge par le critère de Bertrand.}" if verdict
+                        else r"\text{ diverge par le critère de Bertrand.}"))
+            return verdict
+
+        # raison = -1 : série alternée
+        a_n = sp.Abs(c) * terme
+        if not (bool(p < 0) or (p == 0 and bool(q < 0))):
+            st.latex(r"\left| " + sp.latex(u_n) + r" \right| = " + sp.latex(a_n)
+                     + r"\not\to 0 \text{ : la série } " + sp.latex(S_n) + r"\text{ diverge grossièrement.}")
+            return False
+
+        if _bertrand_converge(alpha, beta):
+            st.latex(r"\left| u_n \right| = " + sp.latex(a_n) + r" \text{ et } \sum " + sp.latex(a_n)
+                     + r" \text{ converge (Riemann / Bertrand) : la série } " + sp.latex(S_n)
+                     + r"\text{ converge absolument.}")
+            return True
+
+        st.latex(r"u_n = \left(-1\right)^n a_n \text{ avec } a_n = " + sp.latex(a_n)
+                 + r" \ge 0 \text{, décroissante à partir d'un certain rang, et } \lim_{n \to \infty} a_n = 0")
+        st.latex(r"\text{ La serie de somme partielle}" + sp.latex(S_n) + r" \text{ converge donc par le critère de Leibniz} ")
+        try:
+            graphe(a_n, n, 'violet')
+        except:
+            pass
+        return True
+
+    except TypeError:
+        # comparaison indécidable : on laisse la chaîne complète conclure
+        return None
+
+
+# Critères dans l'ordre de priorité : (nom, test, verdicts retenus)
+CRITERES = [
+    ("formes usuelles", test_formes_usuelles, (True, False)),
+    ("Leibniz", test_Leibniz, (True, False)),
+    ("Riemann", test_Riemann, (True, False)),
+    ("Bertrand", test_bertrand, (True, False)),
+    ("d'Alembert", test_Alembert, (True, False)),
+    ("comparaison", test_comparaison, (True, False)),
+    ("convergence absolue", convergence_absolue, (True,)),
+    ("équivalence", test_equivalence, (True, False)),
+]
+
+
+def _chaine_criteres(u_n, n, n_min):
+    # renvoie (verdict, nom du critère décisif) ; (None, None) si aucun ne conclut
+    for nom, test, retenus in CRITERES:
+        try:
+            verdict = executer_avec_budget(nom, test, u_n, n, n_min, budget=_delai_critere.get(),
+                                           tuable=True)
+        except DelaiDepasse:
+            continue
+        if verdict in retenus:
+            return verdict, nom
+    return None, None
+
+
 def critere(u_n, n, n_min):
 
-    # pile de protection contre les appels circulaires
-    if not hasattr(critere, "_pile"):
-        critere._pile = []
+    # protection contre les appels circulaires : si on retombe sur une suite
+    # déjà en cours d'étude dans cette évaluation → on coupe
+    cle = cle_canonique(u_n)
+    visites = _critere_visites.get()
+    if cle in visites:
+        return None
+
+    # Cache des verdicts : uniquement au premier niveau, car le résultat d'un
+    # appel imbriqué dépend des suites déjà en cours d'étude ; la trace contient
+    # des graphes (Leibniz...), d'où le format dans la clé, et cite le terme tel
+    # qu'il a été saisi, d'où sa forme exacte (non simplifiée) dans la clé
+    premier_niveau = not visites
+    cle_cache = (sp.srepr(u_n), sp.srepr(n), str(n_min), format_graphe_courant())
+    if premier_niveau:
+        trace = CACHE_VERDICTS.get(cle_cache)
+        if trace is not None:
+            verdict, nom, messages = trace
+            st._out.extend(messages)
+            noter_bilan(nature=NATURES.get(verdict), critere=nom)
+            return verdict
+
+    # au premier niveau, les messages sont enregistrés (cache) et relayés au fil de l'eau
+    messages = _Relais(st._out.append)
+    depassements_avant = nombre_depassements()
+    jeton = _critere_visites.set(visites | {cle})
+    jeton_sortie = st.set_out(messages) if premier_niveau else None
+
+    try:
+        if premier_niveau and MODE_CRITERES == "course" and multiprocessing.parent_process() is None:
+            verdict, nom = _course_criteres(u_n, n, n_min)
+        else:
+            verdict, nom = _chaine_criteres(u_n, n, n_min)
+    finally:
+        _critere_visites.reset(jeton)
+        if premier_niveau:
+            st.reset_out(jeton_sortie)
+
+    # un verdict obtenu en sautant des critères (délai) n'est pas mis en cache
+    if premier_niveau and nombre_depassements() == depassements_avant:
+        CACHE_VERDICTS.set(cle_cache, (verdict, nom, list(messages)))
+    if premier_niveau:
+        noter_bilan(nature=NATURES.get(verdict), critere=nom)
+    return verdict
+
+
+# ============================================================
+# Suites et séries de fonctions sur un intervalle I
+# Toute la grille (n, x) est évaluée en une diffusion NumPy (evaluer_grille) ;
+# les sommes partielles sont cumulées le long de n et la convergence uniforme
+# est testée numériquement par sup_x |f_n(x) - f(x)|.
+# ============================================================
+
+HORIZON_FONCTIONS = 200       # indices n de la grille
+POINTS_FONCTIONS = 400        # abscisses x de la grille
+BORNE_GRILLE = 10.0           # borne numérique utilisée pour un intervalle non borné
+TOLERANCE_UNIFORME = 1e-2
+INDICES_TRACES = (1, 2, 5, 10, 50)
 
-    u_s = sp.simplify(u_n)
 
-    # si on retombe sur la même suite → on coupe
-    for old in critere._pile:
-        if sp.simplify(old - u_s).equals(0):
+def lire_intervalle(texte):
+    """
+    "[a, b]", "(a, b)", "]a, b[", "[a, b[", ... → sp.Interval ; vide → ℝ.
+    Bornes : nombres, pi, E, oo, -oo.
+    """
+    texte = (texte or "").strip()
+    if not texte:
+        return S.Reals
+    if len(texte) < 5 or texte[0] not in "[(]" or texte[-1] not in "])[" or "," not in texte:
+        raise ValueError(f"Intervalle illisible : {texte}")
+    a, b = (sp.sympify(borne, locals=LOCALS_SAISIE) for borne in texte[1:-1].split(",", 1))
+    return sp.Interval(a, b, left_open=texte[0] != "[", right_open=texte[-1] != "]")
+
+
+def intervalle_grille(intervalle):
+    # partie de I réellement échantillonnée : bornes infinies ramenées à ±BORNE_GRILLE
+    a, b = intervalle.inf, intervalle.sup
+    gauche_ouverte, droite_ouverte = intervalle.left_open, intervalle.right_open
+    if a.is_infinite or a < -BORNE_GRILLE:
+        a, gauche_ouverte = sp.Integer(-BORNE_GRILLE), False
+    if b.is_infinite or b > BORNE_GRILLE:
+        b, droite_ouverte = sp.Integer(BORNE_GRILLE), False
+    return sp.Interval(a, b, gauche_ouverte, droite_ouverte)
+
+
+def abscisses_intervalle(intervalle):
+    """
+    Abscisses de la grille : nœuds de Tchebychev sur intervalle_grille(I),
+    resserrés près des bords où se joue souvent la convergence uniforme
+    (x**n près de 1, n x e^(-n x) près de 0, ...). Bornes fermées incluses.
+    """
+    intervalle = intervalle_grille(intervalle)
+    a, b = float(intervalle.inf), float(intervalle.sup)
+    noeuds = np.cos(np.pi * (np.arange(POINTS_FONCTIONS) + 0.5) / POINTS_FONCTIONS)[::-1]
+    abscisses = (a + b) / 2 + (b - a) / 2 * noeuds
+    bornes = [v for v, ouverte in ((a, intervalle.left_open), (b, intervalle.right_open)) if not ouverte]
+    return np.unique(np.concatenate([abscisses, bornes]))
+
+
+def convergence_uniforme_numerique(ecarts):
+    # True : sup-norme petite et décroissante ; False : elle stagne ; None : indécis
+    e = ecarts[np.isfinite(ecarts)]
+    if e.size < 8:
+        return None
+    milieu, fin = e[e.size // 2], e[-1]
+    if fin <= TOLERANCE_UNIFORME * max(1.0, e[0]) and fin <= milieu:
+        return True
+    if fin >= 0.9 * milieu and fin > TOLERANCE_UNIFORME * max(1.0, e[0]):
+        return False
+    return None
+
+
+def _limite_numerisable(f, x, abscisses, grille):
+    # limite symbolique utilisable sur la grille : sans n, oo, Sum, Limit, ...
+    if f is None or f.has(SYMBOLE_N, sp.oo, -sp.oo, sp.zoo, sp.nan, sp.Sum, sp.Limit, sp.AccumBounds):
+        return None
+    try:
+        with np.errstate(all="ignore"):
+            valeurs = np.broadcast_to(np.asarray(compiler(x, f)(abscisses), dtype=float), abscisses.shape)
+    except Exception:
+        return None
+    if np.any(np.isfinite(grille[-1]) & ~np.isfinite(valeurs)):
+        return None
+    return valeurs
+
+
+def _etude_uniforme(indices, grille, reference, symbole, nom_limite, intervalle):
+    """
+    Affiche sup_x |grille - reference| pour quelques n et conclut numériquement.
+    Sans limite symbolique : critère de Cauchy uniforme, sup_x |g_n - g_{2n}|.
+    I non borné : la grille ne couvre que J = intervalle_grille(I) ⊂ I ; une
+    convergence uniforme n'est alors constatée que sur J (son absence sur J vaut pour I).
+    """
+    etudie = intervalle_grille(intervalle)
+    tronque = etudie != intervalle
+    nom_etudie = r"J = " + sp.latex(etudie) if tronque else r"I"
+
+    if reference is None:
+        debut = int(indices[0])
+        rangs = np.arange(max(debut, 1), (int(indices[-1]) // 2) + 1)
+        ecarts = np.array([])
+        if rangs.size:
+            with np.errstate(all="ignore"):
+                ecarts = ecarts_uniformes(grille[rangs - debut] - grille[2 * rangs - debut], 0)
+        indices = rangs
+        difference = symbole + r"_n(x) - " + symbole + r"_{2n}(x)"
+        st.latex(r"\text{Limite non explicitée : critère de Cauchy uniforme}")
+    else:
+        ecarts = ecarts_uniformes(grille, reference)
+        difference = symbole + r"_n(x) - " + nom_limite + r"(x)"
+
+    if tronque:
+        st.latex(r"\text{I n'est pas borné : grille sur } " + nom_etudie + r" \subset I")
+
+    finis = np.flatnonzero(np.isfinite(ecarts))
+    if finis.size:
+        choix = sorted({finis[0], finis[finis.size // 4], finis[finis.size // 2], finis[-1]})
+        valeurs = r", \ ".join(
+            r"n = " + str(int(indices[i])) + r" : " + mpmath.nstr(mpmath.mpf(float(ecarts[i])), 3)
+            for i in choix
+        )
+        st.latex(r"\sup_{x \in " + ("J" if tronque else "I") + r"} \left| " + difference + r" \right| \approx \quad " + valeurs)
+
+    verdict = convergence_uniforme_numerique(ecarts)
+    if verdict is True:
+        st.latex(r"\text{La norme uniforme tend vers 0 : convergence uniforme sur } " + nom_etudie + r" \text{ (constat numérique)}")
+        if tronque:
+            st.latex(r"\text{Rien n'est établi sur } I \text{ tout entier : le comportement à l'infini n'est pas échantillonné.}")
+    elif verdict is False:
+        st.latex(r"\text{La norme uniforme ne tend pas vers 0 : pas de convergence uniforme sur } I \text{ (constat numérique)}")
+    else:
+        st.latex(r"\text{Décroissance trop lente pour conclure numériquement sur la convergence uniforme.}")
+
+    # absence de convergence uniforme sur J ⊂ I : vaut aussi pour I
+    domaine = etudie if tronque and verdict is True else intervalle
+    noter_bilan(critere="norme uniforme (numérique)", uniforme=verdict, intervalle_uniforme=str(domaine))
+    return verdict
+
+
+def message_courbes(abscisses, courbes, format):
+    """
+    Plusieurs courbes y(x) sur le même graphe. courbes : liste (étiquette LaTeX, y).
+    png / svg : rendu Agg ; points / binaire : données brutes pour le canevas.
+    """
+    if format in ("points", "binaire"):
+        # JSON : les valeurs non finies deviennent null ; binaire : NaN float32
+        if format == "binaire":
+            encoder = tableau_binaire
+        else:
+            encoder = lambda v: [float(t) if np.isfinite(t) else None for t in np.asarray(v, dtype=float)]
+        return {
+            "type": "plot",
+            "format": format,
+            "content": {
+                "x": encoder(abscisses),
+                "courbes": [{"y": encoder(y), "label": etiquette} for etiquette, y in courbes],
+            },
+        }
+
+    fig = Figure(figsize=(8, 8), dpi=DPI_GRAPHE)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    for etiquette, y in courbes:
+        ax.plot(abscisses, y, label=r"$" + etiquette + "$")
+    ax.set_xlabel("x")
+    ax.legend()
+    fig.subplots_adjust(left=0.1, right=0.97, top=0.97, bottom=0.08)
+    return message_figure(fig, format)
+
+
+def _tracer_courbes(abscisses, indices, grille, reference, symbole, nom_limite):
+    format = format_graphe_courant()
+    if format == "aucun":
+        return
+    lignes = sorted({i for i in (j - int(indices[0]) for j in INDICES_TRACES) if 0 <= i < len(indices)}
+                    | {len(indices) - 1})
+    courbes = [(symbole + "_{" + str(int(indices[i])) + "}", grille[i]) for i in lignes]
+    if reference is not None:
+        courbes.append((nom_limite, reference))
+    st.graphe(message_courbes(abscisses, courbes, format))
+
+
+def suite_fonctions(f_n, n, x, intervalle):
+    st.latex(r"\text{Étude sur } I = " + sp.latex(intervalle))
+    abscisses = abscisses_intervalle(intervalle)
+    indices = np.arange(1, HORIZON_FONCTIONS + 1)
+    grille = evaluer_grille(f_n, n, x, indices, abscisses)
+
+    try:
+        f = executer_avec_budget("limite", limite_suite, f_n, n)
+    except DelaiDepasse:
+        f = None
+    reference = _limite_numerisable(f, x, abscisses, grille)
+    if reference is not None:
+        st.latex(r"\text{Limite simple : } f(x) = \lim_{n \to \infty}" + sp.latex(f_n) + " = " + sp.latex(f))
+
+    verdict = _etude_uniforme(indices, grille, reference, "f", "f", intervalle)
+    _tracer_courbes(abscisses, indices, grille, reference, "f", "f")
+    return verdict
+
+
+def serie_fonctions(u_n, n, x, n_min, intervalle):
+    st.latex(r"\text{Étude sur } I = " + sp.latex(intervalle))
+    abscisses = abscisses_intervalle(intervalle)
+    indices, sommes = sommes_partielles_grille(u_n, n, x, n_min, n_min + HORIZON_FONCTIONS, abscisses)
+
+    try:
+        somme = executer_avec_budget("somme", sp.summation, u_n, (n, n_min, sp.oo),
+                                     budget=_delai_critere.get(), tuable=True)
+    except DelaiDepasse:
+        somme = None
+    except Exception:
+        somme = None
+    reference = _limite_numerisable(somme, x, abscisses, sommes)
+    if reference is not None:
+        st.latex(r"\text{Somme : } S(x) = \sum_{n=" + str(n_min) + r"}^{\infty}" + sp.latex(u_n) + " = " + sp.latex(somme))
+
+    verdict = _etude_uniforme(indices, sommes, reference, "S", "S", intervalle)
+    _tracer_courbes(abscisses, indices, sommes, reference, "S", "S")
+    return verdict
+
+
+# ============================================================
+# Séries entières : terme général réécrit c(x) * a_n * z(x)**n
+# Rayon estimé numériquement (mpmath) puis confirmé symboliquement
+# (Cauchy–Hadamard, puis d'Alembert) ; les séries du bord passent par critere.
+# ============================================================
+
+INDICES_RAYON = (64, 128, 256, 512, 1024)
+PRECISION_RAYON = 30
+
+
+def decomposer_serie_entiere(u, n, x):
+    """
+    u = c(x) * a_n * z(x)**n  →  (a_n, z, c), ou None si la forme n'est pas reconnue.
+    Chaque facteur dépend soit de n seul, soit de x seul, soit vaut b(x)**(p*n + q).
+    """
+    u = sp.expand_power_base(sp.powsimp(sp.sympify(u), combine="exp"), force=True)
+    a_n, z, c = sp.S.One, sp.S.One, sp.S.One
+
+    for facteur in sp.Mul.make_args(u):
+        if not facteur.has(x):
+            a_n *= facteur
+        elif not facteur.has(n):
+            c *= facteur
+        elif facteur.is_Pow and not facteur.base.has(n):
+            exposant = sp.expand(facteur.exp)
+            p, q = exposant.coeff(n, 1), exposant.coeff(n, 0)
+            if p.has(n, x) or q.has(n) or not exposant.equals(p * n + q):
+                return None
+            z *= facteur.base ** p
+            c *= facteur.base ** q
+        else:
             return None
 
-    critere._pile.append(u_s)
+    if z == 1:
+        return None
+    return a_n, z, c
+
 
+def _tendance(valeurs):
+    # limite apparente d'échantillons pris en n, 2n, 4n, ... : (limite, nette)
+    a, b, c = valeurs[-3:]
+    if b < 0.8 * a and c < 0.8 * b:
+        return 0.0, True
+    if b > 1.25 * a and c > 1.25 * b:
+        return math.inf, True
+    return float(c), abs(c - b) <= 1e-2 * abs(c)
+
+
+def _rayon_depuis(L):
+    if L == 0:
+        return math.inf
+    if L == math.inf:
+        return 0.0
+    return 1.0 / L
+
+
+def _estimer_rayon(a_n, n):
     try:
-        L = test_Leibniz(u_n, n, n_min)
-        if L is not None:
-            return L
+        f = compiler(n, sp.Abs(a_n), 'mpmath')
+        with mpmath.workdps(PRECISION_RAYON):
+            modules = {j: mpmath.mpf(f(mpmath.mpf(j))) for j in INDICES_RAYON}
+            modules.update({j + 1: mpmath.mpf(f(mpmath.mpf(j + 1))) for j in INDICES_RAYON})
+            if not all(isinstance(m, mpmath.mpf) and mpmath.isfinite(m) and m > 0
+                       for m in modules.values()):
+                return None
+            racines = [float(mpmath.exp(mpmath.log(modules[j]) / j)) for j in INDICES_RAYON]
+            quotients = [float(modules[j + 1] / modules[j]) for j in INDICES_RAYON]
+    except Exception:
+        return None
 
-        R = test_Riemann(u_n, n, n_min)
-        if R is not None:
-            return R
+    estimations = {}
+    for methode, valeurs in (("racine", racines), ("quotient", quotients)):
+        L, nette = _tendance(valeurs)
+        if nette:
+            estimations[methode] = _rayon_depuis(L)
+    return estimations or None
 
-        B = test_bertrand(u_n, n, n_min)
-        if B is not None:
-            return B
 
-        A = test_Alembert(u_n, n, n_min)
-        if A is not None:
-            return A
+def estimer_rayon(a_n, n):
+    """
+    Estimation numérique du rayon : |a_n|^(1/n) et |a_{n+1}/a_n| évalués (mpmath,
+    30 chiffres) en n = 64, 128, ..., 1024. Renvoie {"racine": R, "quotient": R}
+    pour les suites d'échantillons qui se stabilisent (ou tendent nettement vers
+    0 / l'infini), None si aucune ne conclut. Les quotients convergent plus vite
+    (en 1/n contre log(n)/n) : ils sont préférés quand ils se stabilisent.
+    """
+    a_n = sp.sympify(a_n)
+    return _memoise(("estimer_rayon", a_n, n), lambda: _estimer_rayon(a_n, n))
 
-        C = test_comparaison(u_n, n, n_min)
-        if C is not None:
-            return C
 
-        Cv = convergence_absolue(u_n, n, n_min)
-        if Cv is True:
-            return True
+def _rayon_symbolique(a_n, n, methode):
+    if methode == "racine":
+        expression = simplifier(sp.Abs(a_n) ** (sp.S.One / n))
+    else:
+        expression = simplifier(sp.Abs(a_n.subs(n, n + 1) / a_n))
+    L = limite_suite(expression, n)
+    if L is None or L.has(n) or L is sp.nan or not (L.is_extended_nonnegative is True):
+        return None, expression, L
+    R = sp.oo if L == 0 else (sp.S.Zero if L is sp.oo else simplifier(1 / L))
+    return R, expression, L
+
+
+def rayons_concordants(R, R_num):
+    if R is sp.oo or R_num == math.inf:
+        return R is sp.oo and R_num == math.inf
+    R = float(R)
+    if R == 0 or R_num == 0:
+        return R == 0 and R_num < 1e-6
+    return abs(R - R_num) <= 0.05 * abs(R)
+
+
+def rayon_convergence(a_n, n):
+    """
+    Rayon de convergence de sum a_n z^n. L'estimation numérique décide de l'ordre
+    des méthodes symboliques (d'Alembert d'abord si les quotients se stabilisent
+    et pas les racines) et sert de contrôle. Renvoie (R, méthode) ou (None, None).
+    """
+    estimations = estimer_rayon(a_n, n) or {}
+    R_num = estimations.get("quotient", estimations.get("racine"))
+    if R_num is not None:
+        st.latex(r"\text{Estimation numérique : } R \approx " +
+                 (r"\infty" if R_num == math.inf else mpmath.nstr(mpmath.mpf(R_num), 4)))
+
+    methodes = ["racine", "quotient"]
+    if "quotient" in estimations and "racine" not in estimations:
+        methodes.reverse()
+
+    for methode in methodes:
+        try:
+            R, expression, L = executer_avec_budget(methode, _rayon_symbolique, a_n, n, methode,
+                                                    budget=_delai_critere.get(), tuable=True)
+        except DelaiDepasse:
+            continue
+        except Exception:
+            continue
+        if R is None:
+            continue
+
+        if methode == "racine":
+            st.latex(r"\text{Cauchy–Hadamard : } \lim_{n \to \infty} \left| a_n \right|^{1/n} = "
+                     + r"\lim_{n \to \infty}" + sp.latex(expression) + " = " + sp.latex(L))
+        else:
+            st.latex(r"\text{D'Alembert : } \lim_{n \to \infty} \left| \frac{a_{n+1}}{a_n} \right| = "
+                     + r"\lim_{n \to \infty}" + sp.latex(expression) + " = " + sp.latex(L))
+        st.latex(r"\text{d'où le rayon de convergence } R = " + sp.latex(R))
 
-        E = test_equivalence(u_n, n, n_min)
-        if E is not None:
-            return E
+        if R_num is not None and not rayons_concordants(R, R_num):
+            st.info("L'estimation numérique du rayon ne concorde pas avec le calcul symbolique "
+                    "(convergence lente des échantillons) : le résultat symbolique est retenu.")
+        return R, "Cauchy–Hadamard" if methode == "racine" else "d'Alembert"
 
+    if R_num is not None:
+        st.latex(r"\text{Aucun calcul symbolique n'aboutit : seule l'estimation numérique est disponible.}")
+    return None, None
+
+
+def etude_bord(a_n, n, n_min, z_bord):
+    # série numérique sum a_n z_bord^n : divergence grossière, sinon critere
+    terme = simplifier_borne(a_n * z_bord ** n)
+    S_bord = sp.Sum(terme.subs(n, k), (k, n_min, n))
+    st.latex(r"\text{Au bord } z = " + sp.latex(z_bord) + r" \text{ : série de somme partielle } " + sp.latex(S_bord))
+    try:
+        grossiere = executer_avec_budget("limite", diverge, terme, n)
+        if grossiere is None:
+            return None
+        if not grossiere:
+            return critere(terme, n, n_min)
+        st.latex(r"\text{❌ d'où la série diverge grossièrement en } z = " + sp.latex(z_bord))
+        return False
+    except DelaiDepasse:
+        return None
+    except Exception as e:
+        st.info(f"Détail technique : {e}")
+        return None
+
+
+def serie_entiere(u, n, x, n_min):
+    forme = decomposer_serie_entiere(u, n, x)
+    if forme is None:
+        st.error("Le terme général n'est pas de la forme a_n z(x)^n.")
+        noter_bilan(erreur="terme général hors de la forme a_n z(x)^n")
+        return None
+
+    a_n, z, c = forme
+    ecriture = r"a_n = " + sp.latex(a_n) + r", \quad z(x) = " + sp.latex(z)
+    if c != 1:
+        ecriture += r", \quad \text{facteur } " + sp.latex(c)
+    st.latex(r"\text{Forme } a_n \, z^n \text{ : } " + ecriture)
+
+    R, methode = rayon_convergence(a_n, n)
+    if R is None:
         return None
 
+    if R is sp.oo:
+        st.latex(r"\text{La série converge absolument pour tout } x \in \mathbb{R}")
+        noter_bilan(critere=methode, rayon=str(R))
+        return R
+    if R == 0:
+        st.latex(r"\text{La série ne converge que pour } z(x) = 0")
+        noter_bilan(critere=methode, rayon=str(R))
+        return R
+
+    st.latex(r"\left| z \right| < " + sp.latex(R) + r" \text{ : convergence absolue ; } \left| z \right| > "
+             + sp.latex(R) + r" \text{ : divergence grossière}")
+
+    # un bord que z(x) n'atteint pour aucun réel (ex. z = -R avec z(x) = (x-1)^2) n'est pas étudié
+    bord, atteints = {}, {}
+    for z_bord in (R, -R):
+        try:
+            atteints[z_bord] = sp.solveset(sp.Eq(z, z_bord), x, S.Reals)
+        except Exception:
+            atteints[z_bord] = None
+        if atteints[z_bord] is S.EmptySet:
+            st.latex(r"\text{Le bord } z = " + sp.latex(z_bord)
+                     + r" \text{ n'est atteint pour aucun } x \in \mathbb{R}")
+            continue
+        bord[z_bord] = etude_bord(a_n, n, n_min, z_bord)
+
+    try:
+        domaine = sp.solveset(sp.Abs(z) < R, x, S.Reals)
+        for z_bord, verdict in bord.items():
+            if verdict is True:
+                points = atteints[z_bord]
+                if points is None:
+                    points = sp.solveset(sp.Eq(z, z_bord), x, S.Reals)
+                domaine = domaine | points
+        st.latex(r"\text{Convergence pour } x \in " + sp.latex(domaine)
+                 + (r"" if all(v is not None for v in bord.values()) else r"\text{ (bord non conclu)}"))
+    except Exception:
+        pass
+
+    # les critere du bord ont rempli le bilan : on y remet celui de la série entière
+    noter_bilan(nature=None, critere=methode, rayon=str(R))
+    return R
+
+
+# ============================================================
+# Exécution dans un pool de processus (optionnel)
+# SymPy est du Python pur (GIL) : en mode "processus", chaque analyse part
+# dans un processus déjà préchauffé, ce qui permet d'utiliser tous les cœurs.
+# ============================================================
+
+MODE_EXECUTION = "local"           # "local" (thread de la requête) ou "processus"
+MODE_CRITERES = "sequentiel"       # "sequentiel" ou "course" (critères en parallèle)
+TAILLE_POOL = os.cpu_count() or 2
+TACHES_PAR_PROCESSUS = 100         # recyclage d'un processus (Python >= 3.11)
+
+_pool = None
+_verrou_pool = threading.Lock()
+
+# Courses de critères en cours, partagées avec les processus du pool : la case
+# numero % TAILLE_COURSES vaut le numéro de la course tant qu'elle n'est pas finie
+TAILLE_COURSES = 1024
+_courses = None
+_numeros_courses = itertools.count(1)
+
+
+def course_terminee(numero):
+    return _courses is None or _courses[numero % TAILLE_COURSES] != numero
+
+
+def _initialiser_travailleur(courses=None):
+    global _courses
+    _courses = courses
+    # préchauffage : imports faits, premiers appels SymPy / Matplotlib déjà payés
+    u = sp.sympify("1/n**2", locals=LOCALS_SAISIE)
+    sp.limit_seq(sp.simplify(u), SYMBOLE_N)
+    sp.lambdify(SYMBOLE_N, u, 'numpy')
+    fig = Figure()
+    fig.subplots().plot([0, 1], [0, 1])
+    fig.savefig(io.BytesIO(), format="png")
+
+
+def _obtenir_pool():
+    global _pool, _courses
+    with _verrou_pool:
+        if _pool is None:
+            options = {}
+            if sys.version_info >= (3, 11):
+                options["max_tasks_per_child"] = TACHES_PAR_PROCESSUS
+            contexte = multiprocessing.get_context("spawn")
+            if _courses is None:
+                _courses = contexte.RawArray("q", TAILLE_COURSES)
+            _pool = ProcessPoolExecutor(
+                max_workers=TAILLE_POOL,
+                mp_context=contexte,
+                initializer=_initialiser_travailleur,
+                initargs=(_courses,),
+                **options
+            )
+        return _pool
+
+
+def _tache_prechauffage():
+    # une petite analyse complète : critères, limites et dl déjà parcourus une fois
+    analyser("Série", "1/n**2", "1", format_graphe="aucun")
+    return os.getpid()
+
+
+def prechauffer_pool(attendre=False):
+    """
+    En mode "processus" (ou en mode "course" des critères), crée le pool dès le
+    démarrage et soumet une tâche de préchauffage par processus : ProcessPoolExecutor
+    ne lance ses processus qu'à la demande, les premières requêtes paieraient sinon
+    le démarrage et les imports. Renvoie les futurs des tâches (liste vide sans pool).
+    """
+    if MODE_EXECUTION != "processus" and MODE_CRITERES != "course":
+        return []
+    pool = _obtenir_pool()
+    futurs = [pool.submit(_tache_prechauffage) for _ in range(TAILLE_POOL)]
+    if attendre:
+        for futur in futurs:
+            futur.result()
+    return futurs
+
+
+def _abandonner_pool(pool):
+    # un processus a planté : le pool est cassé, on en recrée un au prochain appel
+    global _pool
+    with _verrou_pool:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def executer_analyse(fonction, *args, **kwargs):
+    """
+    Exécute fonction(*args, **kwargs) selon MODE_EXECUTION : directement, ou dans un
+    processus du pool. Si un processus plante, le pool est recréé et la tâche
+    relancée une fois ; un second plantage lève BrokenProcessPool.
+    """
+    if MODE_EXECUTION != "processus":
+        return fonction(*args, **kwargs)
+
+    for tentative in range(2):
+        pool = _obtenir_pool()
+        try:
+            return pool.submit(fonction, *args, **kwargs).result()
+        except BrokenProcessPool:
+            _abandonner_pool(pool)
+            if tentative == 1:
+                raise
+
+
+def _evaluer_critere(indice, u_n, n, n_min, visites, restant, delai_critere, format_graphe, course):
+    # exécuté dans un processus du pool : un seul critère, dans le format de graphes
+    # de la requête ; sortie, mémo, bilan et profil privés, renvoyés à l'appelant
+    nom, test, retenus = CRITERES[indice]
+    verdict, depasse, erreur = None, False, None
+    if course_terminee(course):
+        # un critère prioritaire a déjà conclu : inutile de commencer
+        return verdict, [], depasse, erreur, {}, {}
+    jetons = (_critere_visites.set(visites), _course.set(course))
+    try:
+        with st.collecte() as messages, memo_symbolique(), delais(restant, delai_critere), \
+                format_graphes(format_graphe), bilan_analyse() as bilan, profilage() as profil:
+            try:
+                verdict = executer_avec_budget(nom, test, u_n, n, n_min, budget=delai_critere,
+                                               tuable=True)
+            except DelaiDepasse:
+                depasse = True
+            except Exception as e:
+                # renvoyée avec les messages déjà produits, comme en séquentiel
+                erreur = e
     finally:
-        critere._pile.pop()
+        _course.reset(jetons[1])
+        _critere_visites.reset(jetons[0])
+    return verdict, messages, depasse, erreur, bilan, profil
+
+
+def _course_criteres(u_n, n, n_min):
+    """
+    Mode "course" : tous les critères sont lancés en même temps dans le pool de
+    processus. On garde le premier verdict décisif dans l'ordre de priorité, avec
+    les messages, le bilan et le profil des critères lus jusque-là ; les critères
+    restants sont annulés, ou interrompus (processus fils tué) s'ils ont commencé.
+    Depuis un processus du pool, ou si le pool plante, repli sur la chaîne séquentielle.
+    """
+    pool = _obtenir_pool()
+    course = next(_numeros_courses)
+    _courses[course % TAILLE_COURSES] = course
+    arguments = (_critere_visites.get(), temps_restant(), _delai_critere.get(),
+                 format_graphe_courant(), course)
+    futurs = [
+        pool.submit(_evaluer_critere, indice, u_n, n, n_min, *arguments)
+        for indice in range(len(CRITERES))
+    ]
+
+    messages = []
+    depassements = []
+    verdict, decisif, erreur = None, None, None
+    try:
+        for (nom, test, retenus), futur in zip(CRITERES, futurs):
+            resultat, messages_critere, depasse, erreur, bilan, profil = futur.result()
+            messages.extend(messages_critere)
+            noter_bilan(**{cle: valeur for cle, valeur in bilan.items() if valeur is not None})
+            fusionner_profil(profil)
+            if depasse:
+                depassements.append(nom)
+            if erreur is not None:
+                break
+            if resultat in retenus:
+                verdict, decisif = resultat, nom
+                break
+    except BrokenProcessPool:
+        _abandonner_pool(pool)
+        return _chaine_criteres(u_n, n, n_min)
+    finally:
+        _courses[course % TAILLE_COURSES] = 0
+        for futur in futurs:
+            futur.cancel()
+
+    if _depassements.get() is not None:
+        _depassements.get().extend(depassements)
+    st._out.extend(messages)
+    if erreur is not None:
+        raise erreur
+    return verdict, decisif
 
 
 # ============================================================
@@ -858,83 +2810,926 @@ def index():
     return render_template("index.html")
 
 
+def analyser(type_input, user_input1, user_input2, delai=DELAI_GLOBAL, delai_critere=DELAI_CRITERE,
+             format_graphe=None, sortie=None, bilan=None, intervalle=None, profil=None):
+    """
+    Étude complète d'une entrée (Suite / Série) ; renvoie la liste des messages.
+    Les messages sont collectés dans une sortie propre à l'appel (cf. st.collecte).
+    delai / delai_critere : délai global et budget par critère (secondes, None = illimité) ;
+    en cas de dépassement, les résultats sont partiels et marqués (message "timeout").
+    format_graphe : "png", "svg", "points" ou "binaire" (par défaut FORMAT_GRAPHE).
+    sortie : liste de sortie à utiliser (ex. _Relais pour diffuser les messages au fil de l'eau).
+    bilan : dictionnaire complété par la nature trouvée, le critère décisif et, en cas
+    d'échec, l'erreur ("erreur").
+    intervalle : intervalle d'étude des suites / séries de fonctions (ex. "[0, 1[", défaut ℝ).
+    profil : dictionnaire complété par la durée et le nombre d'appels de chaque étape.
+    """
+    user_input1 = (user_input1 or "").strip()
+    user_input2 = (user_input2 or "").strip()
+
+    with st.collecte(sortie) as out, format_graphes(format_graphe), memo_symbolique(), \
+            delais(delai, delai_critere), bilan_analyse(bilan), profilage(profil):
+        try:
+            # Déclaration de n comme dans ton code
+            n = SYMBOLE_N
+            x = SYMBOLE_X
+
+            u = sp.sympify(user_input1, locals=LOCALS_SAISIE)
+            u_n = simplifier_borne(u)
+
+            if type_input == "Série":
+                if user_input1 and not user_input2:
+                    st.latex(r"\text{Veuillez donner la valeur de l'indice de depart}")
+                    return out
+
+                if (not user_input1) and user_input2:
+                    st.latex(r"\text{Veuillez entre le terme général de la série}")
+                    return out
+
+                if user_input1 and user_input2:
+                    n_min = int(user_input2)
+
+                    # S_n exactement comme ton code (avec k global)
+                    S_n = sp.Sum(u.subs(n, k), (k, n_min, n))
+
+                    st.latex(r"\text {Vous avez entré la série de somme partielle }" + sp.latex(S_n))
+                    st.latex(sp.latex(S_n))
+                    st.latex(r"\text{Considérons donc son terme général de rang n ,} u_n =" + sp.latex(u_n))
+
+                    grossiere = executer_avec_budget("limite", diverge, u_n, n)
+                    if grossiere:
+                        # limite symbolique établie : u_n ne tend pas vers 0
+                        noter_bilan(nature="diverge", critere="divergence grossière")
+                        st.latex(r"\text{❌ d'où la série diverge grossièrement .}")
+                    elif grossiere is not None:
+                        critere(u, n, n_min)
+                        executer_avec_budget("graphe", graphe, S_n, n, 'blue')
+                        executer_avec_budget("graphe", graphe, u_n, n, 'red')
+
+            elif type_input == "Série entière":
+                if not (user_input1 and user_input2):
+                    st.latex(r"\text{Veuillez donner le terme général et l'indice de depart}")
+                    return out
+
+                n_min = int(user_input2)
+                S_x = sp.Sum(u.subs(n, k), (k, n_min, sp.oo))
+                st.latex(r"\text {Vous avez entré la série entière }" + sp.latex(S_x))
+                serie_entiere(u, n, x, n_min)
+
+            elif type_input == "Suite de fonctions":
+                if user_input1:
+                    st.latex(r"\text {Vous avez entré la suite de fonctions } f_n(x) = " + sp.latex(u))
+                    suite_fonctions(u_n, n, x, lire_intervalle(intervalle))
+
+            elif type_input == "Série de fonctions":
+                if not (user_input1 and user_input2):
+                    st.latex(r"\text{Veuillez donner le terme général et l'indice de depart}")
+                    return out
+
+                n_min = int(user_input2)
+                S_x = sp.Sum(u.subs(n, k), (k, n_min, sp.oo))
+                st.latex(r"\text {Vous avez entré la série de fonctions }" + sp.latex(S_x))
+                serie_fonctions(u_n, n, x, n_min, lire_intervalle(intervalle))
+
+            else:
+                if user_input1:
+                    st.latex(r"\text {Vous avez entré la suite définie par }" + r"u_n " + "=" + sp.latex(u))
+                    lim = executer_avec_budget("limite", limite_suite, u_n, n)
+
+                    noter_bilan(nature="converge" if lim.is_real else "diverge", critere="limite")
+                    if lim.is_real:
+                        st.latex(r"\lim_{n \to \infty}" + sp.latex(u_n) + " = " + sp.latex(lim))
+                        st.latex(r"\text{ d'où cette suite converge.}")
+                    else:
+                        st.latex(r"\lim_{n \to \infty}" + sp.latex(u_n) + " = " + sp.latex(lim))
+                        st.latex(r"\text{ d'où cette suite diverge .}")
+
+                    executer_avec_budget("graphe", graphe, u_n, n, 'blue')
+
+        except DelaiDepasse:
+            # délai global épuisé : on renvoie les résultats déjà obtenus
+            pass
+
+        except (SyntaxError, TypeError, ValueError, Exception) as e:
+            st.error("Entrée invalide. Veuillez entrer une expression correcte.")
+            st.info(f"Détail technique : {e}")
+            noter_bilan(erreur=f"{type(e).__name__}: {e}")
+
+    return out
+
+
 @app.route("/compute", methods=["POST"])
 def compute():
     data = request.get_json(force=True) or {}
-    out = []
-    st.set_out(out)
-
     type_input = data.get("type_input", "")
-    user_input1 = (data.get("user_input1") or "").strip()
-    user_input2 = (data.get("user_input2") or "").strip()
-
-    try:
-        # Déclaration de n comme dans ton code
-        n = sp.symbols('n', integer=True, positive=True)
-        x = sp.symbols('x', real=True)
-
-        u = sp.sympify(
-            user_input1,
-            locals={
-                "n": n,
-                "arctan": atan, "arcsin": asin, "arccos": acos,
-                "arctanh": atanh, "arcsinh": asinh, "arccosh": acosh,
-                "arcsec": asec, "arccot": acot, "arccsc": acsc,
-                "sin": sin
-            }
-        )
-        u_n = sp.simplify(u)
+    debut = time.perf_counter()
+    profil = {}
+
+    connu = CATALOGUE.consulter(type_input, data.get("user_input1"),
+                                data.get("user_input2"), data.get("format_graphe"),
+                                data.get("intervalle"))
+    if connu is not None:
+        out = connu["messages"]
+        enregistrer_metriques("catalogue", type_input, time.perf_counter() - debut)
+    else:
+        try:
+            out, _, duree, profil = executer_analyse(
+                _analyser_chronometre,
+                type_input,
+                data.get("user_input1"),
+                data.get("user_input2"),
+                format_graphe=data.get("format_graphe"),
+                intervalle=data.get("intervalle"),
+            )
+            enregistrer_metriques("compute", type_input, duree, profil)
+        except BrokenProcessPool:
+            out = [{"type": "error", "content": "Le processus de calcul s'est arrêté brutalement."}]
 
-        if type_input == "Série":
-            if user_input1 and not user_input2:
-                st.latex(r"\text{Veuillez donner la valeur de l'indice de depart}")
-                return jsonify({"messages": out})
+    reponse = {
+        "messages": out,
+        "timed_out": any(m["type"] == "timeout" for m in out),
+    }
+    if PROFILAGE_REPONSE or data.get("profil"):
+        reponse["profil"] = rapport_profil(time.perf_counter() - debut, profil)
+    return jsonify(reponse)
 
-            if (not user_input1) and user_input2:
-                st.latex(r"\text{Veuillez entre le terme général de la série}")
-                return jsonify({"messages": out})
 
-            if user_input1 and user_input2:
-                n_min = int(user_input2)
+def flux_analyse(type_input, user_input1, user_input2, format_graphe=None, intervalle=None,
+                 profiler=False):
+    """
+    Générateur de lignes NDJSON : chaque message est émis dès qu'il est produit,
+    puis une dernière ligne {"type": "fin", "timed_out": ...} (avec "profil" si demandé).
+    En mode "processus", l'analyse tourne ailleurs : les messages arrivent en bloc à la fin.
+    """
+    fin = object()
+    file = queue.Queue()
+    debut = time.perf_counter()
+    profil = {}
 
-                # S_n exactement comme ton code (avec k global)
-                S_n = sp.Sum(u.subs(n, k), (k, n_min, n))
+    def cible():
+        try:
+            connu = CATALOGUE.consulter(type_input, user_input1, user_input2, format_graphe, intervalle)
+            if connu is not None:
+                for message in connu["messages"]:
+                    file.put(message)
+                enregistrer_metriques("catalogue", type_input, time.perf_counter() - debut)
+            elif MODE_EXECUTION == "processus":
+                messages, _, duree, profil_calcul = executer_analyse(
+                    _analyser_chronometre, type_input, user_input1, user_input2,
+                    format_graphe=format_graphe, intervalle=intervalle)
+                profil.update(profil_calcul)
+                for message in messages:
+                    file.put(message)
+                enregistrer_metriques("flux", type_input, duree, profil)
+            else:
+                analyser(type_input, user_input1, user_input2, format_graphe=format_graphe,
+                         intervalle=intervalle, sortie=_Relais(file.put), profil=profil)
+                enregistrer_metriques("flux", type_input, time.perf_counter() - debut, profil)
+        except BrokenProcessPool:
+            file.put({"type": "error", "content": "Le processus de calcul s'est arrêté brutalement."})
+        finally:
+            file.put(fin)
+
+    threading.Thread(target=contextvars.copy_context().run, args=(cible,), daemon=True).start()
+
+    delai_depasse = False
+    while True:
+        message = file.get()
+        if message is fin:
+            break
+        delai_depasse = delai_depasse or message["type"] == "timeout"
+        yield json.dumps(message) + "\n"
+
+    fin_flux = {"type": "fin", "timed_out": delai_depasse}
+    if profiler or PROFILAGE_REPONSE:
+        fin_flux["profil"] = rapport_profil(time.perf_counter() - debut, profil)
+    yield json.dumps(fin_flux) + "\n"
+
+
+@app.route("/compute/flux", methods=["POST"])
+def compute_flux():
+    # même entrée que /compute, réponse en NDJSON diffusée au fil du calcul
+    data = request.get_json(force=True) or {}
+    flux = flux_analyse(
+        data.get("type_input", ""),
+        data.get("user_input1"),
+        data.get("user_input2"),
+        format_graphe=data.get("format_graphe"),
+        intervalle=data.get("intervalle"),
+        profiler=bool(data.get("profil")),
+    )
+    return Response(
+        stream_with_context(flux),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-                st.latex(r"\text {Vous avez entré la série de somme partielle }" + sp.latex(S_n))
-                st.latex(sp.latex(S_n))
-                st.latex(r"\text{Considérons donc son terme général de rang n ,} u_n =" + sp.latex(u_n))
 
-                if diverge(u_n, n):
-                    lim = sp.limit_seq(u_n, n)
-                    if lim is not None:
-                        st.latex(r"\lim_{n \to \infty}" + sp.latex(u_n) + " = " + sp.latex(lim) + r"\neq 0")
-                        st.latex(r"\text{❌ d'où la série diverge grossièrement .}")
-                else:
-                    critere(u, n, n_min)
-                    graphe(S_n, n, 'blue')
-                    graphe(u_n, n, 'red')
+# ============================================================
+# Analyse par lots (correction en masse)
+# Les entrées identiques à l'écriture près (même expression canonique,
+# même indice de départ) ne sont calculées qu'une fois ; les caches
+# (verdicts, mémo symbolique, graphes) sont partagés entre les éléments.
+# ============================================================
+
+TAILLE_MAX_LOT = 1000
+
+
+def cle_element(type_input, user_input1, user_input2, intervalle=None):
+    # clé de déduplication : forme canonique de l'expression saisie
+    user_input1 = (user_input1 or "").strip()
+    user_input2 = (user_input2 or "").strip()
+    intervalle = "".join((intervalle or "").split())
+    try:
+        terme = sp.srepr(sp.sympify(user_input1, locals=LOCALS_SAISIE)) if user_input1 else ""
+    except Exception:
+        terme = user_input1
+    try:
+        n_min = str(int(user_input2)) if user_input2 else ""
+    except ValueError:
+        n_min = user_input2
+    return (type_input or "", terme, n_min, intervalle)
+
 
+def _analyser_chronometre(type_input, user_input1, user_input2, format_graphe=None, intervalle=None):
+    # durée, bilan et profil relevés là où tourne le calcul (processus du pool compris)
+    debut = time.perf_counter()
+    bilan, profil = {}, {}
+    out = analyser(type_input, user_input1, user_input2, format_graphe=format_graphe, bilan=bilan,
+                   intervalle=intervalle, profil=profil)
+    return list(out), bilan, time.perf_counter() - debut, profil
+
+
+def iterer_lot(elements, format_graphe=None, travailleurs=None):
+    """
+    Analyse une liste d'éléments {type_input, user_input1, user_input2[, intervalle]} et
+    produit un résultat par élément, dans l'ordre, dès qu'il est disponible :
+    messages, nature ("converge" / "diverge" / None), critere décisif, timed_out,
+    duree (secondes), profil (durée et appels par étape), erreur (None si l'analyse
+    a pu être menée) et doublon_de (indice de l'élément identique déjà calculé, ou None).
+    Un élément qui porte déjà une erreur (ligne illisible, cf. lire_elements) n'est
+    pas analysé : son résultat la reprend.
+    En mode "processus", les éléments sont répartis sur le pool.
+    """
+    if travailleurs is None:
+        travailleurs = TAILLE_POOL if MODE_EXECUTION == "processus" else 1
+
+    uniques = {}      # clé → indice du premier élément
+    cles = []
+    for indice, element in enumerate(elements):
+        if element.get("erreur"):
+            cle = ("erreur", indice)
         else:
-            if user_input1:
-                st.latex(r"\text {Vous avez entré la suite définie par }" + r"u_n " + "=" + sp.latex(u))
-                u_n = sp.simplify(u)
-                lim = sp.limit_seq(u_n, n)
-
-                if lim.is_real:
-                    st.latex(r"\lim_{n \to \infty}" + sp.latex(u_n) + " = " + sp.latex(lim))
-                    st.latex(r"\text{ d'où cette suite converge.}")
-                else:
-                    st.latex(r"\lim_{n \to \infty}" + sp.latex(u_n) + " = " + sp.latex(lim))
-                    st.latex(r"\text{ d'où cette suite diverge .}")
+            cle = cle_element(element.get("type_input"), element.get("user_input1"),
+                              element.get("user_input2"), element.get("intervalle"))
+        uniques.setdefault(cle, indice)
+        cles.append(cle)
+
+    def calculer(indice):
+        element = elements[indice]
+        if element.get("erreur"):
+            return {"messages": [], "duree": None, "profil": {}, "erreur": element["erreur"],
+                    "nature": None, "critere": None}
+        try:
+            messages, bilan, duree, profil = executer_analyse(
+                _analyser_chronometre,
+                element.get("type_input", ""),
+                element.get("user_input1"),
+                element.get("user_input2"),
+                format_graphe=format_graphe,
+                intervalle=element.get("intervalle"),
+            )
+            enregistrer_metriques("lot", element.get("type_input", ""), duree, profil)
+            # bilan["erreur"] : échec signalé par analyser (entrée invalide, ...)
+            return {"messages": messages, "duree": duree, "profil": profil, "erreur": None, **bilan}
+        except Exception as e:
+            return {"messages": [], "duree": None, "profil": {}, "erreur": f"{type(e).__name__}: {e}",
+                    "nature": None, "critere": None}
+
+    executeur = ThreadPoolExecutor(max_workers=max(1, travailleurs))
+    try:
+        calculs = {premier: executeur.submit(calculer, premier) for premier in uniques.values()}
+
+        for indice, (element, cle) in enumerate(zip(elements, cles)):
+            premier = uniques[cle]
+            calcul = calculs[premier].result()
+            yield {
+                "indice": indice,
+                "type_input": element.get("type_input", ""),
+                "user_input1": element.get("user_input1"),
+                "user_input2": element.get("user_input2"),
+                "intervalle": element.get("intervalle"),
+                "nature": calcul["nature"],
+                "critere": calcul["critere"],
+                "messages": calcul["messages"],
+                "timed_out": any(m["type"] == "timeout" for m in calcul["messages"]),
+                "duree": calcul["duree"],
+                "profil": calcul["profil"],
+                "erreur": calcul["erreur"],
+                "doublon_de": None if premier == indice else premier,
+            }
+    finally:
+        executeur.shutdown(wait=False, cancel_futures=True)
 
-                graphe(u_n, n, 'blue')
 
-    except (SyntaxError, TypeError, ValueError, Exception) as e:
-        st.error("Entrée invalide. Veuillez entrer une expression correcte.")
-        st.info(f"Détail technique : {e}")
+def analyser_lot(elements, format_graphe=None, travailleurs=None):
+    # version liste de iterer_lot
+    return list(iterer_lot(elements, format_graphe=format_graphe, travailleurs=travailleurs))
+
+
+@app.route("/compute/lot", methods=["POST"])
+def compute_lot():
+    data = request.get_json(force=True) or {}
+    elements = data.get("elements")
+    if not isinstance(elements, list) or not all(isinstance(e, dict) for e in elements):
+        return jsonify({"erreur": "\"elements\" doit être une liste d'objets."}), 400
+    if len(elements) > TAILLE_MAX_LOT:
+        return jsonify({"erreur": f"Lot trop grand (maximum {TAILLE_MAX_LOT} éléments)."}), 400
+
+    debut = time.perf_counter()
+    resultats = analyser_lot(elements, format_graphe=data.get("format_graphe"))
+    return jsonify({
+        "resultats": resultats,
+        "duree": time.perf_counter() - debut,
+    })
+
+
+# ============================================================
+# Catalogue persistant (SQLite) des séries de référence
+# Forme canonique de l'entrée (+ format des graphes) → nature, critère décisif,
+# messages (explication LaTeX et graphes déjà calculés). Rempli hors ligne par
+# `python app.py catalogue`, consulté par les routes avant tout calcul.
+# ============================================================
+
+CATALOGUE_CHEMIN = os.environ.get(
+    "CATALOGUE_SERIES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogue.sqlite")
+)
+# à incrémenter quand les explications changent : les anciennes entrées sont ignorées
+VERSION_CATALOGUE = 4
+
+# Séries de référence (L2) utilisées par défaut pour construire le catalogue
+SERIES_REFERENCE = [
+    "1/n", "1/n**2", "1/n**3", "1/sqrt(n)", "1/n**(3/2)", "1/n**n",
+    "(-1)**n/n", "(-1)**n/sqrt(n)", "(-1)**n/n**2", "(-1)**n/log(n+1)",
+    "1/2**n", "1/3**n", "(2/3)**n", "n/2**n", "n**2/2**n", "2**n/factorial(n)",
+    "1/factorial(n)", "n/(n**2+1)", "1/(n*(n+1))", "(n+1)/(n**3+2)",
+    "1/(n*log(n))", "1/(n*log(n)**2)", "log(n)/n**2", "log(n)/n",
+    "sin(n)/n**2", "cos(n)/n**2", "sin(1/n)", "1-cos(1/n)", "exp(-n)",
+    "exp(1/n)-1", "log(1+1/n)", "1/n**2 + (-1)**n/n", "n", "(-1)**n", "1",
+]
+
+
+class Catalogue:
+    """
+    Table SQLite clé → résultat d'analyse. Ouverte à la demande ; tant que le
+    fichier n'existe pas, les consultations renvoient simplement None.
+    Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self.hits = 0
+        self.misses = 0
+        self._connexion = None
+        self._verrou = threading.Lock()
+
+    def _ouvrir(self, creer=False):
+        if self._connexion is None:
+            if not creer and not os.path.exists(self.chemin):
+                return None
+            self._connexion = sqlite3.connect(self.chemin, check_same_thread=False)
+            self._connexion.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                " cle TEXT PRIMARY KEY, version INTEGER, type_input TEXT, user_input1 TEXT,"
+                " user_input2 TEXT, nature TEXT, critere TEXT, messages TEXT, cree REAL)"
+            )
+        return self._connexion
+
+    @staticmethod
+    def cle(type_input, user_input1, user_input2, format_graphe=None, intervalle=None):
+        format_graphe = format_graphe if format_graphe in FORMATS_GRAPHE else FORMAT_GRAPHE
+        return json.dumps([*cle_element(type_input, user_input1, user_input2, intervalle), format_graphe])
+
+    def consulter(self, type_input, user_input1, user_input2, format_graphe=None, intervalle=None):
+        # → {"nature", "critere", "messages"} ou None
+        cle = self.cle(type_input, user_input1, user_input2, format_graphe, intervalle)
+        with self._verrou:
+            connexion = self._ouvrir()
+            ligne = None if connexion is None else connexion.execute(
+                "SELECT nature, critere, messages FROM verdicts WHERE cle = ? AND version = ?",
+                (cle, VERSION_CATALOGUE),
+            ).fetchone()
+            if ligne is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        nature, critere, messages = ligne
+        return {"nature": nature, "critere": critere, "messages": json.loads(messages)}
+
+    def enregistrer(self, resultat, format_graphe=None):
+        # resultat : élément produit par iterer_lot
+        cle = self.cle(resultat["type_input"], resultat["user_input1"], resultat["user_input2"],
+                       format_graphe, resultat.get("intervalle"))
+        with self._verrou:
+            connexion = self._ouvrir(creer=True)
+            with connexion:
+                connexion.execute(
+                    "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (cle, VERSION_CATALOGUE, resultat["type_input"], resultat["user_input1"],
+                     resultat["user_input2"], resultat["nature"], resultat["critere"],
+                     json.dumps(resultat["messages"]), time.time()),
+                )
+
+    def stats(self):
+        with self._verrou:
+            connexion = self._ouvrir()
+            entrees = 0 if connexion is None else connexion.execute(
+                "SELECT COUNT(*) FROM verdicts WHERE version = ?", (VERSION_CATALOGUE,)
+            ).fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                "entrees": entrees,
+                "hits": self.hits,
+                "misses": self.misses,
+                "taux": self.hits / total if total else 0.0,
+            }
+
+
+CATALOGUE = Catalogue(CATALOGUE_CHEMIN)
+
+
+def construire_catalogue(elements, formats=("binaire",), catalogue=None):
+    """
+    Calcule les éléments et les enregistre dans le catalogue, pour chaque format
+    de graphe demandé. Les analyses incomplètes (délai, erreur) ne sont pas gardées.
+    Renvoie le nombre d'entrées écrites.
+    """
+    catalogue = CATALOGUE if catalogue is None else catalogue
+    ecrites = 0
+    for format_graphe in formats:
+        for resultat in iterer_lot(elements, format_graphe=format_graphe):
+            if resultat["timed_out"] or resultat["erreur"] is not None:
+                continue
+            catalogue.enregistrer(resultat, format_graphe)
+            ecrites += 1
+    return ecrites
+
+
+# ============================================================
+# Métriques
+#   - profil par réponse (PROFILAGE_REPONSE ou champ "profil": true) : durée
+#     totale, durée et appels de chaque étape, taux de succès des caches ;
+#   - GET /metrics : histogrammes de latence au format texte Prometheus.
+# En mode "processus", les profils reviennent avec les résultats ; les caches
+# comptés sont ceux du processus serveur.
+# ============================================================
 
-    return jsonify({"messages": out})
+PROFILAGE_REPONSE = False
+SEUILS_HISTOGRAMME = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogramme:
+    """Histogramme cumulatif (sémantique Prometheus). Utilisable depuis plusieurs threads."""
+
+    def __init__(self, seuils=SEUILS_HISTOGRAMME):
+        self.seuils = seuils
+        self.compteurs = [0] * len(seuils)
+        self.total = 0
+        self.somme = 0.0
+        self._verrou = threading.Lock()
+
+    def observer(self, valeur):
+        with self._verrou:
+            for i, seuil in enumerate(self.seuils):
+                if valeur <= seuil:
+                    self.compteurs[i] += 1
+            self.total += 1
+            self.somme += valeur
+
+    def lignes(self, nom, etiquettes):
+        with self._verrou:
+            compteurs, total, somme = list(self.compteurs), self.total, self.somme
+        lignes = [
+            f'{nom}_bucket{{{etiquettes},le="{seuil}"}} {compteur}'
+            for seuil, compteur in zip(self.seuils, compteurs)
+        ]
+        lignes.append(f'{nom}_bucket{{{etiquettes},le="+Inf"}} {total}')
+        lignes.append(f"{nom}_sum{{{etiquettes}}} {somme}")
+        lignes.append(f"{nom}_count{{{etiquettes}}} {total}")
+        return lignes
+
+
+# types d'entrée connus (menu de index.html) ; tout autre type est compté sous "autre",
+# pour que le nombre de séries exposées reste borné quoi que le client envoie
+TYPES_METRIQUES = ("Suite", "Série", "Série entière", "Suite de fonctions", "Série de fonctions")
+
+# (route, type d'entrée) → durées des analyses ; étape → durées par appel (moyenne par analyse)
+_HISTOGRAMMES_ANALYSES = {}
+_HISTOGRAMMES_ETAPES = {}
+_verrou_metriques = threading.Lock()
+
+
+def _histogramme(registre, cle):
+    with _verrou_metriques:
+        if cle not in registre:
+            registre[cle] = Histogramme()
+        return registre[cle]
+
+
+def enregistrer_metriques(route, type_input, duree, profil=None):
+    type_input = type_input if type_input in TYPES_METRIQUES else "autre"
+    _histogramme(_HISTOGRAMMES_ANALYSES, (route, type_input)).observer(duree)
+    for etape, mesure in (profil or {}).items():
+        if mesure["appels"]:
+            _histogramme(_HISTOGRAMMES_ETAPES, etape).observer(mesure["duree"] / mesure["appels"])
+
+
+def statistiques_caches():
+    return {
+        "verdicts": CACHE_VERDICTS.stats(),
+        "symbolique": MEMO_SYMBOLIQUE.stats(),
+        "lambdify": CACHE_LAMBDIFY.stats(),
+        "graphes": CACHE_GRAPHES.stats(),
+        "developpements": CACHE_DEVELOPPEMENTS.stats(),
+        "catalogue": CATALOGUE.stats(),
+    }
+
+
+def rapport_profil(duree, profil):
+    # étapes triées de la plus coûteuse à la moins coûteuse
+    etapes = sorted(profil.items(), key=lambda e: e[1]["duree"], reverse=True)
+    return {
+        "duree": duree,
+        "etapes": {nom: {"appels": m["appels"], "duree": m["duree"]} for nom, m in etapes},
+        "caches": {nom: stats["taux"] for nom, stats in statistiques_caches().items()},
+    }
+
+
+def _echapper(valeur):
+    return str(valeur).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def texte_metriques():
+    # copie des registres sous verrou : une requête peut y ajouter un histogramme
+    with _verrou_metriques:
+        analyses = sorted(_HISTOGRAMMES_ANALYSES.items())
+        etapes = sorted(_HISTOGRAMMES_ETAPES.items())
+
+    lignes = [
+        "# HELP convergence_analyse_duree_secondes Durée des analyses (route, type d'entrée).",
+        "# TYPE convergence_analyse_duree_secondes histogram",
+    ]
+    for (route, type_input), histogramme in analyses:
+        etiquettes = f'route="{_echapper(route)}",type="{_echapper(type_input)}"'
+        lignes += histogramme.lignes("convergence_analyse_duree_secondes", etiquettes)
+
+    lignes += [
+        "# HELP convergence_etape_duree_secondes Durée moyenne d'un appel à une étape, par analyse.",
+        "# TYPE convergence_etape_duree_secondes histogram",
+    ]
+    for etape, histogramme in etapes:
+        lignes += histogramme.lignes("convergence_etape_duree_secondes", f'etape="{_echapper(etape)}"')
+
+    caches = statistiques_caches()
+    for nom, aide, type_metrique in (
+        ("hits", "Succès de cache.", "counter"),
+        ("misses", "Échecs de cache.", "counter"),
+        ("taux", "Taux de succès de cache.", "gauge"),
+    ):
+        metrique = f"convergence_cache_{nom}" + ("_total" if type_metrique == "counter" else "")
+        lignes += [f"# HELP {metrique} {aide}", f"# TYPE {metrique} {type_metrique}"]
+        lignes += [f'{metrique}{{cache="{cache}"}} {stats[nom]}' for cache, stats in caches.items()]
+
+    return "\n".join(lignes) + "\n"
+
+
+@app.route("/metrics")
+def metrics():
+    return Response(texte_metriques(), mimetype="text/plain; version=0.0.4")
+
+
+# ============================================================
+# Banc d'essai
+# Corpus de séries dont la nature est connue : chaque terme est analysé à froid
+# (caches vidés, sans graphe), le verdict est comparé à l'attendu et les durées
+# (totale et par étape : limite, chaque critère, dl) sont relevées. Le résultat
+# s'écrit en JSON et sert de référence pour repérer les ralentissements.
+# ============================================================
+
+VERSION_BANC = 2
+SEUIL_RALENTISSEMENT = 1.25     # durée actuelle / durée de référence
+PLANCHER_RALENTISSEMENT = 0.05  # secondes : en dessous, l'écart n'est pas significatif
+
+# (famille, terme général, indice de départ, nature attendue)
+CORPUS_BANC = [
+    ("Riemann", "1/n", "1", "diverge"),
+    ("Riemann", "1/n**2", "1", "converge"),
+    ("Riemann", "1/sqrt(n)", "1", "diverge"),
+    ("Riemann", "1/n**(3/2)", "1", "converge"),
+    ("Riemann", "n/(n**2+1)", "1", "diverge"),
+    ("Riemann", "(n+1)/(n**3+2)", "1", "converge"),
+    ("Bertrand", "1/(n*log(n))", "2", "diverge"),
+    ("Bertrand", "1/(n*log(n)**2)", "2", "converge"),
+    ("Bertrand", "log(n)/n**2", "1", "converge"),
+    ("Bertrand", "log(n)/n", "1", "diverge"),
+    ("alternée", "(-1)**n/n", "1", "converge"),
+    ("alternée", "(-1)**n/sqrt(n)", "1", "converge"),
+    ("alternée", "(-1)**n/log(n)", "2", "converge"),
+    ("alternée", "(-1)**n", "1", "diverge"),
+    ("géométrique", "1/2**n", "0", "converge"),
+    ("géométrique", "(2/3)**n", "0", "converge"),
+    ("géométrique", "n**2/2**n", "0", "converge"),
+    ("géométrique", "(3/2)**n", "0", "diverge"),
+    ("factorielle", "1/factorial(n)", "0", "converge"),
+    ("factorielle", "2**n/factorial(n)", "0", "converge"),
+    ("factorielle", "factorial(n)/n**n", "1", "converge"),
+    ("factorielle", "factorial(n)/2**n", "0", "diverge"),
+    ("logarithme", "log(1+1/n)", "1", "diverge"),
+    ("logarithme", "log(1+1/n**2)", "1", "converge"),
+    ("logarithme", "1/log(n)**2", "2", "diverge"),
+    ("logarithme", "log(n)**2/n**(3/2)", "1", "converge"),
+    ("équivalents", "sin(1/n)", "1", "diverge"),
+    ("équivalents", "1-cos(1/n)", "1", "converge"),
+    ("équivalents", "exp(1/n)-1", "1", "diverge"),
+    ("équivalents", "sin(n)/n**2", "1", "converge"),
+    # termes difficiles : positivité ou monotonie hors de portée de solve_univariate_inequality,
+    # développements à pousser loin, oscillations
+    ("difficile", "sin(n)**2/n**2", "1", "converge"),
+    ("difficile", "abs(sin(n))/n**2", "1", "converge"),
+    ("difficile", "n**(1/n)-1", "1", "diverge"),
+    ("difficile", "1/log(n)**log(n)", "2", "converge"),
+    ("difficile", "1/(n**2-n*sin(n))", "1", "converge"),
+    ("difficile", "(n**2+sin(n))/(n**4+cos(n))", "1", "converge"),
+    ("difficile", "(1-1/n)**(n**2)", "1", "converge"),
+    ("difficile", "1/(n*log(n)*log(log(n)))", "3", "diverge"),
+]
+
+
+def vider_caches():
+    # le catalogue n'est pas concerné : analyser ne le consulte pas
+    for cache in (CACHE_VERDICTS, MEMO_SYMBOLIQUE, CACHE_LAMBDIFY, CACHE_GRAPHES, CACHE_DEVELOPPEMENTS):
+        cache.clear()
+
+
+def statut_verdict(nature, attendu, erreur=None):
+    if erreur is not None:
+        return "erreur"
+    if nature is None:
+        return "non conclu"
+    return "ok" if nature == attendu else "faux"
+
+
+def mesurer_terme(famille, terme, n_min, attendu, repetitions=3):
+    """
+    Analyse à froid d'une série, répétée : durée médiane, durée médiane de chaque
+    étape, nature trouvée, critère décisif, erreur éventuelle de l'analyse et
+    statut du verdict.
+    """
+    durees, etapes, bilan, delai_depasse, erreur = [], {}, {}, False, None
+    for _ in range(repetitions):
+        vider_caches()
+        messages, bilan, duree, profil = _analyser_chronometre("Série", terme, n_min, format_graphe="aucun")
+        durees.append(duree)
+        delai_depasse = delai_depasse or any(m["type"] == "timeout" for m in messages)
+        erreur = erreur or bilan.get("erreur")
+        for etape, mesure in profil.items():
+            etapes.setdefault(etape, []).append(mesure["duree"])
+
+    nature = bilan.get("nature")
+    return {
+        "famille": famille,
+        "terme": terme,
+        "n_min": n_min,
+        "attendu": attendu,
+        "nature": nature,
+        "critere": bilan.get("critere"),
+        "statut": statut_verdict(nature, attendu, erreur),
+        "erreur": erreur,
+        "timed_out": delai_depasse,
+        "duree": statistics.median(durees),
+        # une étape absente d'une répétition compte pour 0
+        "etapes": {etape: statistics.median(valeurs + [0.0] * (repetitions - len(valeurs)))
+                   for etape, valeurs in etapes.items()},
+    }
+
+
+def banc_essai(corpus=None, repetitions=3, suivi=None):
+    """
+    Passe tout le corpus (par défaut CORPUS_BANC) ; renvoie le document JSON du banc :
+    versions, un résultat par terme (cf. mesurer_terme) et durée totale par étape.
+    suivi(resultat) est appelé après chaque terme.
+    """
+    corpus = CORPUS_BANC if corpus is None else corpus
+    termes = []
+    for famille, terme, n_min, attendu in corpus:
+        resultat = mesurer_terme(famille, terme, n_min, attendu, repetitions)
+        termes.append(resultat)
+        if suivi is not None:
+            suivi(resultat)
+
+    etapes = {}
+    for resultat in termes:
+        for etape, duree in resultat["etapes"].items():
+            etapes[etape] = etapes.get(etape, 0.0) + duree
+
+    return {
+        "version": VERSION_BANC,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "sympy": sp.__version__,
+        "mpmath": mpmath.__version__,
+        "repetitions": repetitions,
+        "duree": sum(resultat["duree"] for resultat in termes),
+        "etapes": etapes,
+        "termes": termes,
+    }
+
+
+def _ralenti(avant, apres, seuil, plancher):
+    return apres > avant * seuil and apres - avant > plancher
+
+
+def comparer_bancs(reference, actuel, seuil=SEUIL_RALENTISSEMENT, plancher=PLANCHER_RALENTISSEMENT):
+    """
+    Écarts entre deux bancs : ralentissements (par terme et par étape, au-delà de
+    seuil × référence et de plancher secondes) et verdicts qui ont changé.
+    Renvoie une liste de {"genre", "objet", "avant", "apres"}.
+    """
+    ecarts = []
+    # étapes cumulées sur les seuls termes présents dans les deux bancs
+    etapes_avant, etapes_apres = {}, {}
+    anciens = {(r["terme"], r["n_min"]): r for r in reference.get("termes", [])}
+    for resultat in actuel["termes"]:
+        ancien = anciens.get((resultat["terme"], resultat["n_min"]))
+        if ancien is None:
+            continue
+        for cumul, etapes in ((etapes_avant, ancien["etapes"]), (etapes_apres, resultat["etapes"])):
+            for etape, duree in etapes.items():
+                cumul[etape] = cumul.get(etape, 0.0) + duree
+        if _ralenti(ancien["duree"], resultat["duree"], seuil, plancher):
+            ecarts.append({"genre": "ralentissement", "objet": resultat["terme"],
+                           "avant": ancien["duree"], "apres": resultat["duree"]})
+        if resultat["nature"] != ancien["nature"]:
+            ecarts.append({"genre": "verdict", "objet": resultat["terme"],
+                           "avant": ancien["nature"], "apres": resultat["nature"]})
+
+    for etape, duree in etapes_apres.items():
+        avant = etapes_avant.get(etape)
+        if avant is not None and _ralenti(avant, duree, seuil, plancher):
+            ecarts.append({"genre": "ralentissement", "objet": "étape " + etape,
+                           "avant": avant, "apres": duree})
+    return ecarts
+
+
+# ============================================================
+# Ligne de commande
+#   python app.py                         → serveur web
+#   python app.py lot termes.txt --jobs 4 → verdicts en JSONL sur stdout
+#   python app.py catalogue               → construction du catalogue
+# ============================================================
+
+def lire_elements(lignes, type_input="Série", n_min="1"):
+    """
+    Une entrée par ligne : soit un objet JSON {type_input, user_input1, user_input2},
+    soit directement le terme général. Lignes vides et commentaires (#) ignorés.
+    Une ligne JSON illisible donne un élément en erreur (cf. iterer_lot), sans
+    interrompre la lecture des suivantes.
+    """
+    elements = []
+    for numero, ligne in enumerate(lignes, start=1):
+        ligne = ligne.strip()
+        if not ligne or ligne.startswith("#"):
+            continue
+        if ligne.startswith("{"):
+            try:
+                elements.append(json.loads(ligne))
+            except json.JSONDecodeError as e:
+                elements.append({"type_input": type_input, "user_input1": ligne,
+                                 "erreur": f"JSONDecodeError: ligne {numero} : {e}"})
+        else:
+            elements.append({
+                "type_input": type_input,
+                "user_input1": ligne,
+                "user_input2": n_min if type_input == "Série" else "",
+            })
+    return elements
+
+
+def lancer_banc(options):
+    corpus = [entree for entree in CORPUS_BANC if options.famille is None or entree[0] in options.famille]
+
+    def suivi(resultat):
+        print(f"{resultat['statut']:<11} {resultat['duree']:8.3f} s  {resultat['terme']:<32} "
+              f"{resultat['nature'] or '-'} ({resultat['erreur'] or resultat['critere'] or '-'})", flush=True)
+
+    mesures = banc_essai(corpus, max(1, options.repetitions), suivi)
+    faux = [r["terme"] for r in mesures["termes"] if r["statut"] in ("faux", "erreur")]
+    erreurs = sum(r["statut"] == "erreur" for r in mesures["termes"])
+    non_conclus = sum(r["statut"] == "non conclu" for r in mesures["termes"])
+    print(f"{len(mesures['termes'])} termes en {mesures['duree']:.2f} s : "
+          f"{len(faux) - erreurs} verdict(s) faux, {erreurs} erreur(s), {non_conclus} non conclu(s)")
+    for etape, duree in sorted(mesures["etapes"].items(), key=lambda e: e[1], reverse=True):
+        print(f"  {etape:<22} {duree:8.3f} s")
+
+    if options.sortie:
+        with open(options.sortie, "w", encoding="utf-8") as f:
+            json.dump(mesures, f, ensure_ascii=False, indent=1)
+
+    ecarts = []
+    if options.reference:
+        with open(options.reference, encoding="utf-8") as f:
+            ecarts = comparer_bancs(json.load(f), mesures, seuil=options.seuil)
+        for ecart in ecarts:
+            if ecart["genre"] == "ralentissement":
+                print(f"RALENTISSEMENT {ecart['objet']} : {ecart['avant']:.3f} s → {ecart['apres']:.3f} s")
+            else:
+                print(f"VERDICT {ecart['objet']} : {ecart['avant']} → {ecart['apres']}")
+        if not ecarts:
+            print("Aucun écart avec la référence.")
+
+    return 1 if faux or ecarts else 0
+
+
+def main(arguments=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convergence des suites et séries.")
+    commandes = parser.add_subparsers(dest="commande")
+
+    lot = commandes.add_parser("lot", help="analyse hors ligne d'un fichier de termes (JSONL sur stdout)")
+    lot.add_argument("fichier", nargs="?", default="-",
+                     help="fichier de termes, un par ligne ou en JSONL (défaut : stdin)")
+    lot.add_argument("--jobs", "-j", type=int, default=1, help="nombre de processus de calcul")
+    lot.add_argument("--no-plots", action="store_true", help="ne pas produire les graphes")
+    lot.add_argument("--type", default="Série", choices=("Série", "Suite"),
+                     help="type des lignes données en texte brut")
+    lot.add_argument("--n-min", default="1", help="indice de départ des séries en texte brut")
+
+    construction = commandes.add_parser("catalogue", help="construit le catalogue des séries de référence")
+    construction.add_argument("fichier", nargs="?", default=None,
+                              help="liste de termes (même format que `lot`) ; défaut : SERIES_REFERENCE")
+    construction.add_argument("--jobs", "-j", type=int, default=1, help="nombre de processus de calcul")
+    construction.add_argument("--formats", default="binaire",
+                              help="formats de graphe à préparer, séparés par des virgules")
+    construction.add_argument("--chemin", default=CATALOGUE_CHEMIN, help="fichier SQLite du catalogue")
+
+    banc = commandes.add_parser("banc", help="banc d'essai : verdicts et durées sur CORPUS_BANC")
+    banc.add_argument("--sortie", "-o", default=None, help="fichier JSON où écrire les mesures")
+    banc.add_argument("--reference", "-r", default=None,
+                      help="mesures JSON de référence : signale ralentissements et verdicts changés")
+    banc.add_argument("--repetitions", "-n", type=int, default=3, help="analyses par terme (médiane)")
+    banc.add_argument("--seuil", type=float, default=SEUIL_RALENTISSEMENT,
+                      help="rapport de durées au-delà duquel un ralentissement est signalé")
+    banc.add_argument("--famille", action="append", default=None,
+                      help="ne passer que cette famille du corpus (option répétable)")
+
+    options = parser.parse_args(arguments)
+
+    if options.commande is None:
+        # avec le rechargeur du mode debug, seul le processus qui sert les requêtes a un pool
+        if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+            prechauffer_pool()
+        app.run(host="127.0.0.1", port=5000, debug=True)
+        return 0
+
+    if options.commande == "banc":
+        return lancer_banc(options)
+
+    global MODE_EXECUTION, TAILLE_POOL
+    if options.jobs > 1:
+        MODE_EXECUTION, TAILLE_POOL = "processus", options.jobs
+
+    if options.commande == "catalogue":
+        if options.fichier is None:
+            elements = lire_elements(SERIES_REFERENCE)
+        else:
+            with open(options.fichier, encoding="utf-8") as f:
+                elements = lire_elements(f)
+        formats = [f for f in options.formats.split(",") if f in FORMATS_GRAPHE]
+        try:
+            ecrites = construire_catalogue(elements, formats, Catalogue(options.chemin))
+        finally:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+        print(f"{ecrites} entrées écrites dans {options.chemin}")
+        return 0
+
+    if options.fichier == "-":
+        elements = lire_elements(sys.stdin, options.type, options.n_min)
+    else:
+        with open(options.fichier, encoding="utf-8") as f:
+            elements = lire_elements(f, options.type, options.n_min)
+
+    format_graphe = "aucun" if options.no_plots else "binaire"
+    try:
+        for resultat in iterer_lot(elements, format_graphe=format_graphe):
+            sys.stdout.write(json.dumps(resultat, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    finally:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+    return 0
 
 
 if __name__ == "__main__":
-    app.run(host="127.0.0.1", port=5000, debug=True)
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -9,59 +9,48 @@ async function run() {
     const type_input  = document.getElementById("type_input").value;
     const user_input1 = document.getElementById("user_input1").value;
     const user_input2 = document.getElementById("user_input2").value;
+    const intervalle  = document.getElementById("intervalle").value;
 
     const outDiv = document.getElementById("out");
-    outDiv.innerHTML = "<p>Calcul en cours…</p>";
+    outDiv.innerHTML = "";
+    const attente = document.createElement("p");
+    attente.textContent = "Calcul en cours…";
+    outDiv.appendChild(attente);
 
     try {
-        const response = await fetch("/compute", {
+        /* réponse NDJSON : un message par ligne, affiché dès réception */
+        const response = await fetch("/compute/flux", {
             method: "POST",
             headers: { "Content-Type": "application/json" },
             body: JSON.stringify({
                 type_input: type_input,
                 user_input1: user_input1,
-                user_input2: user_input2
+                user_input2: user_input2,
+                intervalle: intervalle,
+                format_graphe: "binaire"
             })
         });
 
-        const data = await response.json();
-        outDiv.innerHTML = "";
+        const lecteur = response.body.getReader();
+        const decodeur = new TextDecoder();
+        let reste = "";
 
-        data.messages.forEach(msg => {
+        while (true) {
+            const { value, done } = await lecteur.read();
+            if (done) break;
+            reste += decodeur.decode(value, { stream: true });
 
-            if (msg.type === "latex") {
-                const div = document.createElement("div");
-                div.className = "msg latex";
-                try {
-                    katex.render(msg.content, div, { throwOnError: false, displayMode: true });
-                } catch (e) {
-                    div.textContent = msg.content;
+            const lignes = reste.split("\n");
+            reste = lignes.pop();
+            lignes.forEach(ligne => {
+                if (!ligne.trim()) return;
+                const msg = JSON.parse(ligne);
+                if (msg.type !== "fin") {
+                    outDiv.insertBefore(elementMessage(msg), attente);
                 }
-                outDiv.appendChild(div);
-            }
-
-            else if (msg.type === "info") {
-                const div = document.createElement("div");
-                div.className = "msg info";
-                div.textContent = "ℹ️ " + msg.content;
-                outDiv.appendChild(div);
-            }
-
-            else if (msg.type === "error") {
-                const div = document.createElement("div");
-                div.className = "msg error";
-                div.textContent = "❌ " + msg.content;
-                outDiv.appendChild(div);
-            }
-
-            else if (msg.type === "plot") {
-                const img = document.createElement("img");
-                img.src = "data:image/png;base64," + msg.content;
-                img.className = "plot";
-                outDiv.appendChild(img);
-            }
-
-        });
+            });
+        }
+        attente.remove();
 
     } catch (err) {
         outDiv.innerHTML = "";
@@ -72,9 +61,162 @@ async function run() {
     }
 }
 
+function elementMessage(msg) {
+
+    if (msg.type === "plot") {
+        return elementGraphe(msg);
+    }
+
+    const div = document.createElement("div");
+
+    if (msg.type === "latex") {
+        div.className = "msg latex";
+        try {
+            katex.render(msg.content, div, { throwOnError: false, displayMode: true });
+        } catch (e) {
+            div.textContent = msg.content;
+        }
+    }
+
+    else if (msg.type === "info") {
+        div.className = "msg info";
+        div.textContent = "ℹ️ " + msg.content;
+    }
+
+    else if (msg.type === "timeout") {
+        div.className = "msg timeout";
+        div.textContent = "⏱️ " + msg.content;
+    }
+
+    else if (msg.type === "error") {
+        div.className = "msg error";
+        div.textContent = "❌ " + msg.content;
+    }
+
+    return div;
+}
+
+/* Graphe : image PNG / SVG, ou données tracées sur un canevas
+   (nuage de points u_n, ou plusieurs courbes y(x) pour les fonctions) */
+function elementGraphe(msg) {
+    if (msg.format === "points" || msg.format === "binaire") {
+        const c = msg.content;
+        const tableau = msg.format === "binaire" ? decoderFloat32 : (v => v);
+        if (c.courbes) {
+            const series = c.courbes.map((courbe, i) => ({
+                y: tableau(courbe.y),
+                color: PALETTE[i % PALETTE.length]
+            }));
+            const legende = c.courbes.map((courbe, i) =>
+                "\\color{" + PALETTE[i % PALETTE.length] + "}{" + courbe.label + "}").join(",\\ ");
+            return avecLegende(tracerCanevas(tableau(c.x), series, true, "x"), legende);
+        }
+        const series = [{ y: tableau(c.y), color: c.color || "blue" }];
+        return avecLegende(tracerCanevas(tableau(c.x), series, false, "n"), c.label);
+    }
+    const img = document.createElement("img");
+    const mime = msg.format === "svg" ? "image/svg+xml" : "image/png";
+    img.src = "data:" + mime + ";base64," + msg.content;
+    img.className = "plot";
+    return img;
+}
+
+const PALETTE = ["blue", "red", "green", "orange", "purple", "brown", "black"];
+
+/* base64 → Float32Array (float32 petit-boutiste, cf. tableau_binaire côté Python) */
+function decoderFloat32(b64) {
+    const bin = atob(b64);
+    const octets = new Uint8Array(bin.length);
+    for (let i = 0; i < bin.length; i++) {
+        octets[i] = bin.charCodeAt(i);
+    }
+    return new Float32Array(octets.buffer);
+}
+
+/* Légende LaTeX (KaTeX) sous le canevas */
+function avecLegende(canvas, label) {
+    const div = document.createElement("div");
+    div.appendChild(canvas);
+    if (label) {
+        const legende = document.createElement("div");
+        legende.className = "msg latex";
+        try {
+            katex.render(label, legende, { throwOnError: false });
+        } catch (e) {
+            legende.textContent = label;
+        }
+        div.appendChild(legende);
+    }
+    return div;
+}
+
+/* series : [{y, color}] partageant les abscisses xs ; relier = courbes, sinon points.
+   Les valeurs non finies (null, NaN) sont sautées. */
+function tracerCanevas(xs, series, relier, nomAxe) {
+    const canvas = document.createElement("canvas");
+    canvas.className = "plot";
+    canvas.width = 640;
+    canvas.height = 640;
+    const ctx = canvas.getContext("2d");
+    const marge = 50;
+    const fini = v => v !== null && Number.isFinite(v);
+
+    let xmin = Infinity, xmax = -Infinity, ymin = Infinity, ymax = -Infinity;
+    for (let i = 0; i < xs.length; i++) {
+        xmin = Math.min(xmin, xs[i]); xmax = Math.max(xmax, xs[i]);
+    }
+    series.forEach(s => {
+        for (let i = 0; i < s.y.length; i++) {
+            if (fini(s.y[i])) {
+                ymin = Math.min(ymin, s.y[i]); ymax = Math.max(ymax, s.y[i]);
+            }
+        }
+    });
+    const dx = (xmax - xmin) || 1, dy = (ymax - ymin) || 1;
+    const X = x => marge + (x - xmin) / dx * (canvas.width - 2 * marge);
+    const Y = y => canvas.height - marge - (y - ymin) / dy * (canvas.height - 2 * marge);
+
+    ctx.fillStyle = "white";
+    ctx.fillRect(0, 0, canvas.width, canvas.height);
+
+    ctx.strokeStyle = "#444";
+    ctx.strokeRect(marge, marge, canvas.width - 2 * marge, canvas.height - 2 * marge);
+    ctx.fillStyle = "#444";
+    ctx.font = "12px sans-serif";
+    ctx.fillText(xmin.toPrecision(3), marge, canvas.height - marge + 15);
+    ctx.fillText(xmax.toPrecision(3), canvas.width - marge - 30, canvas.height - marge + 15);
+    ctx.fillText(ymin.toPrecision(4), 2, canvas.height - marge);
+    ctx.fillText(ymax.toPrecision(4), 2, marge + 10);
+    ctx.fillText(nomAxe, canvas.width / 2, canvas.height - 15);
+
+    series.forEach(s => {
+        ctx.fillStyle = s.color;
+        ctx.strokeStyle = s.color;
+        ctx.beginPath();
+        let enCours = false;
+        for (let i = 0; i < xs.length; i++) {
+            if (!fini(s.y[i])) {
+                enCours = false;
+                continue;
+            }
+            if (relier) {
+                if (enCours) ctx.lineTo(X(xs[i]), Y(s.y[i]));
+                else ctx.moveTo(X(xs[i]), Y(s.y[i]));
+                enCours = true;
+            } else {
+                ctx.moveTo(X(xs[i]) + 2.5, Y(s.y[i]));
+                ctx.arc(X(xs[i]), Y(s.y[i]), 2.5, 0, 2 * Math.PI);
+            }
+        }
+        if (relier) ctx.stroke();
+        else ctx.fill();
+    });
+    return canvas;
+}
+
 /* Entrée clavier = lancer (comportement type Streamlit) */
 document.addEventListener("DOMContentLoaded", function () {
-    ["user_input1", "user_input2"].forEach(id => {
+    ["user_input1", "user_input2", "intervalle"].forEach(id => {
         const el = document.getElementById(id);
         if (!el) return;
         el.addEventListener("keydown", function (e) {